@@ -1,41 +1,194 @@
 # user_interface.py
-from flask import Flask, request, jsonify, render_template_string, send_file
+from flask import Flask, Response, request, jsonify, render_template_string, g
 from flask_cors import CORS
 import pandas as pd
 import re
-import seaborn as sns
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_squared_error, accuracy_score, precision_score, recall_score
 from datetime import datetime, date
 import numpy as np
 import os
+import sys
 import io
 import base64
-
-
-app = Flask(__name__)
-CORS(app)
+import hashlib
+import functools
+import json
+import gzip
+import cProfile
+import contextlib
+import importlib.util
+import time
+import tracemalloc
+import glob
+import multiprocessing
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+try:
+    import resource     # peak RSS; not available on Windows
+except ImportError:
+    resource = None
+
+# seaborn/matplotlib, statsmodels and sklearn are imported by the
+# functions that use them, so a fresh worker serves the data endpoints with
+# only Flask and pandas loaded
+os.environ.setdefault("MPLBACKEND", "Agg")  # read when matplotlib is first imported
+PREWARM = os.environ.get("MSY_PREWARM") == "1"
+
+
+def prewarm():
+    # imports the plotting and modelling stack ahead of the first request
+    # that needs it; run at startup with MSY_PREWARM=1 or from a server hook
+    start = time.perf_counter()
+    import seaborn  # noqa: F401
+    import matplotlib.figure  # noqa: F401
+    import statsmodels.api  # noqa: F401
+    import sklearn.preprocessing  # noqa: F401
+    import sklearn.metrics  # noqa: F401
+    return time.perf_counter() - start
+
+
+app = Flask(__name__, static_folder=None)   # assets are served from /assets, fingerprinted
+CORS(app, expose_headers=["X-Scatter-Mode", "X-Points-Drawn", "X-Points-Total",
+                         "X-Total-Rows", "X-Next-Cursor", "X-Dataset"])
 
 
 UPLOAD_FOLDER = "uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-
-# Global storage
-group = None
-category = None
-item = None # full uploaded dataframe (never mutated)
-temp_df_preds = None        # dataframe containing actual & predicted values after building model
-train_df = None
-test_df = None
-split_before_date = None
-split_after_date = None
-last_isolate_by = None
-last_isolate_value = None
+CACHE_FOLDER = "cache"
+os.makedirs(CACHE_FOLDER, exist_ok=True)
+CACHE_FORMAT = 5    # bump when cached frames change shape or meaning
+
+# each named dataset (a location or snapshot) is loaded from its own folder;
+# "default" comes from MSY_DATA_FOLDER, others from any folder under MSY_DATA_ROOT
+DATA_FOLDER = os.environ.get("MSY_DATA_FOLDER", "data")
+DATA_ROOT = os.path.realpath(os.environ.get("MSY_DATA_ROOT", os.path.dirname(os.path.abspath(DATA_FOLDER))))
+DEFAULT_DATASET = "default"
+DATASET_NAME = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+DATA_YEAR = int(os.environ.get("MSY_DATA_YEAR", 2025))   # month sheets carry no year
+
+# workbook reading: calamine is much faster than openpyxl when installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+# Arrow string kernels clean "$1,234.56"-style columns several times faster
+ARROW_STRINGS = importlib.util.find_spec("pyarrow") is not None
+INGEST_WORKERS = int(os.environ.get("MSY_INGEST_WORKERS", os.cpu_count() or 1))
+# shipment logs are streamed in chunks of this many rows
+SHIPMENT_CHUNK_ROWS = int(os.environ.get("MSY_SHIPMENT_CHUNK_ROWS", 100_000))
+# shipment columns read (found by keyword, like _find_column) and their dtypes;
+# every column is parsed as text and the float64 ones are coerced afterwards,
+# so a stray cell ("-", "n/a") becomes a missing value instead of failing the load
+SHIPMENT_FIELDS = {"ingredient": str, "quantity": "float64", "unit": str, "number": "float64", "frequen": str}
+
+
+# Loaded datasets. Each load of a named source publishes a new immutable
+# version, "<name>@<hash of the source files>", holding:
+#   name, source    the dataset name and its folder, ingredient and shipment paths
+#   group, category, item   frames served to the plots (never mutated)
+#   item_rows, ing, ship_rows   merge inputs kept for incremental loads
+#   ship_lines      every distinct shipment line, for the reconciliation
+#   sources         source file path -> month, size, mtime, loaded_at
+#   memory          bytes per frame before/after dtype compaction
+#   usage_cube      month x ingredient usage matrix with label indexes
+#   rankings        per-month bestseller orderings and item x ingredient matrix
+#   query_index     per-frame sorted row positions for the /query filter columns
+#   models          forecast results, filled in by the background fit
+# Requests pick ?dataset=<name> (its latest version) or ?dataset=<name>@<hash>,
+# and otherwise get the most recent load of any name.
+DATASET_BUDGET = int(os.environ.get("MSY_DATASET_BUDGET_MB", 1024)) * 2**20
+datasets = OrderedDict()    # version -> dataset, least recently used first
+datasets_lock = threading.Lock()
+latest_versions = {}        # name -> its most recent version
+current_version = None      # the most recent load
+load_lock = threading.Lock()    # one load at a time
+model_lock = threading.Lock()
+
+# background load jobs started by POST /upload
+LOAD_MODES = ("full", "incremental")   # also the load.<mode> span names
+LOAD_STAGES = ("reading months", "cleaning", "item/ingredient merge", "shipment merge", "publishing")
+JOB_HISTORY = 20
+jobs = OrderedDict()    # job id -> progress and result, oldest first
+jobs_changed = threading.Condition()   # guards jobs, notified on every update
+
+# timing spans per pipeline stage and per-endpoint request counters, served
+# on /metrics in Prometheus text format
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+stage_stats = {}        # stage -> latency histogram, rows, bytes, heap peak
+request_stats = {}      # (endpoint, method, status) -> count
+request_seconds = {}    # endpoint -> latency histogram
+metrics_lock = threading.Lock()
+# MSY_PROFILING=1 lets any request add ?profile=1 to get a cProfile dump,
+# and traces allocations so every span records its own heap peak
+PROFILING = os.environ.get("MSY_PROFILING") == "1"
+PROFILE_FOLDER = "profiles"
+open_spans = []     # heap windows of the spans running now, guarded by metrics_lock
+if PROFILING:
+    tracemalloc.start()
+
+PLOT_CACHE_SIZE = int(os.environ.get("MSY_PLOT_CACHE_SIZE", 128))
+plot_cache = OrderedDict()
+plot_cache_lock = threading.Lock()
+# /query row positions and the /reconciliation and /plot_results bodies
+# vary a lot in size, so their cache is bounded by bytes, not entries
+RESULT_CACHE_BYTES = int(os.environ.get("MSY_RESULT_CACHE_MB", 64)) * 2**20
+result_cache = OrderedDict()    # key -> (value, bytes), least recently used first
+result_cache_lock = threading.Lock()
+result_cache_held = {"bytes": 0}
+
+# worker processes are started from request and load-job threads; forking
+# there would copy whatever locks other threads hold at that moment, so
+# every process pool starts its workers fresh
+PROCESS_CONTEXT = multiprocessing.get_context("spawn")
+
+# bounded pool for chart rendering; each render owns its own Figure.
+# MSY_PLOT_EXECUTOR=process sidesteps the GIL on multi-core hosts.
+PLOT_WORKERS = int(os.environ.get("MSY_PLOT_WORKERS", min(4, os.cpu_count() or 1)))
+# with MSY_PREWARM=1 each render worker imports the plotting stack as it starts
+if os.environ.get("MSY_PLOT_EXECUTOR") == "process":
+    render_pool = ProcessPoolExecutor(
+        max_workers=PLOT_WORKERS, mp_context=PROCESS_CONTEXT, initializer=prewarm if PREWARM else None,
+    )
+else:
+    render_pool = ThreadPoolExecutor(max_workers=PLOT_WORKERS, initializer=prewarm if PREWARM else None)
+
+ERRORBARS = ("ci", "none", "bootstrap")
+
+# groupBy choice -> dataset frame
+GROUP_FRAMES = {"Group": "group", "Category": "category", "Item": "item"}
+
+# /query filters (parameter -> indexed column) and page sizes
+QUERY_FILTERS = {"month": "month", "category": "Category", "item": "Item Name"}
+QUERY_PAGE_ROWS = 1000
+QUERY_MAX_ROWS = int(os.environ.get("MSY_QUERY_MAX_ROWS", 10_000))
+
+# shipment normalization: deliveries per month and (dimension, size) of units
+SHIPMENTS_PER_MONTH = {
+    "daily": 365 / 12,
+    "weekly": 52 / 12,
+    "biweekly": 26 / 12,
+    "bi-weekly": 26 / 12,
+    "monthly": 1.0,
+}
+UNIT_FACTORS = {
+    "g": ("mass", 1.0),
+    "gram": ("mass", 1.0),
+    "grams": ("mass", 1.0),
+    "kg": ("mass", 1000.0),
+    "lb": ("mass", 453.592),
+    "lbs": ("mass", 453.592),
+    "oz": ("mass", 28.3495),
+    "count": ("count", 1.0),
+    "pcs": ("count", 1.0),
+    "pc": ("count", 1.0),
+    "piece": ("count", 1.0),
+    "pieces": ("count", 1.0),
+    "each": ("count", 1.0),
+    "dozen": ("count", 12.0),
+}
+
+# scatterplots above this many points are sampled (or binned with hexbin)
+SCATTER_POINT_BUDGET = int(os.environ.get("MSY_SCATTER_POINTS", 5000))
+SCATTER_MODES = ("auto", "full", "sample", "hexbin")
 
 
 
@@ -50,9 +203,6 @@ HTML_TEMPLATE = """
   <meta charset="UTF-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1.0" />
   <title>MSY Dashboard</title>
-  <script src="https://unpkg.com/react@17/umd/react.development.js"></script>
-  <script src="https://unpkg.com/react-dom@17/umd/react-dom.development.js"></script>
-  <script src="https://unpkg.com/@babel/standalone/babel.min.js"></script>
   <style>
     .top-bar { display:flex; justify-content:space-between; align-items:center; padding:10px; border-bottom:1px solid #ccc; }
     label { margin-right:6px; }
@@ -61,528 +211,1813 @@ HTML_TEMPLATE = """
 </head>
 <body>
   <div id="root"></div>
-  {% raw %}
-  <script type="text/babel">
- 
-    // File Upload Tab (now auto-loads default data)
-    const FileUpload = ({ setColumnNames, setTargetVariable }) => {
-        const [loading, setLoading] = React.useState(false);
-        const [status, setStatus] = React.useState("Loading default data...");
-
-        React.useEffect(() => {
-            const fetchDefaultData = async () => {
-            setLoading(true);
-            try {
-                const response = await fetch("/upload", { method: "POST" }); // no file, triggers default
-                const data = await response.json();
-
-                if (data.columns) {
-                setColumnNames(data.columns);
-                setTargetVariable(data.columns[0]);
-                setStatus(data.note || "Default data loaded successfully.");
-                } else {
-                setStatus(data.error || "Failed to load default data.");
-                }
-            } catch (error) {
-                console.error("Error loading default data:", error);
-                setStatus("An error occurred while loading default data.");
-            } finally {
-                setLoading(false);
-            }
-            };
-
-            fetchDefaultData();
-        }, [setColumnNames, setTargetVariable]);
-
-        return (
-            <div>
-            <h2>Data Load Status</h2>
-            <p>{loading ? "Loading default data..." : status}</p>
-            </div>
-        );
-    };
-
-
-
-
-
-    // Graphing Tab
-    const Graphing = ({ modelBuilt, modelTargets }) => {
-        const [x, setX] = React.useState("");
-        const [y, setY] = React.useState("");
-        const [groupBy, setGroupBy] = React.useState("");
-        const [plotType, setPlotType] = React.useState("scatterplot");
-        const [note, setNote] = React.useState("");
-        const [columnOptions, setColumnOptions] = React.useState([]);
-        const [imgUrl, setImgUrl] = React.useState("");
-        const [mse, setMse] = React.useState(null);
-        const [varVal, setVar] = React.useState(null);
-        const [loadingPlot, setLoadingPlot] = React.useState(false);
-        const [loadingResults, setLoadingResults] = React.useState(false);
-
-        // Fetch columns when "Group By" changes
-        React.useEffect(() => {
-            if (!groupBy) {
-            setColumnOptions([]);
-            return;
-            }
+  {% for src in scripts %}
+  <script src="{{ src }}"></script>
+  {% endfor %}
+</body>
+</html>
+"""
 
-            fetch("/get_dataframe_columns", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ groupBy }),
-            })
-            .then((r) => r.json())
-            .then((data) => {
-                setColumnOptions(data.columns || []);
-            })
-            .catch((e) => console.error(e));
-        }, [groupBy]);
-
-        const handlePlot = async () => {
-            setNote(""); // clear old warnings
-
-            if (!x && !y) {
-            alert("Please select at least one variable.");
-            return;
-            }
+# frontend assets, read and fingerprinted once at startup. static/app.min.js
+# is built from frontend/app.jsx by frontend/build.py; React is vendored.
+ASSET_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+ASSET_FILES = ("react-18.3.1.production.min.js", "react-dom-18.3.1.production.min.js", "app.min.js")
+FRONTEND_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "app.jsx")
+
+
+def load_assets():
+    # hashed name -> (body, gzipped body), and file name -> hashed URL
+    assets, urls = {}, {}
+    for fname in ASSET_FILES:
+        with open(os.path.join(ASSET_FOLDER, fname), "rb") as f:
+            body = f.read()
+        stem, ext = os.path.splitext(fname)
+        hashed = f"{stem}.{hashlib.sha256(body).hexdigest()[:12]}{ext}"
+        assets[hashed] = (body, gzip.compress(body, compresslevel=9))
+        urls[fname] = f"/assets/{hashed}"
+    return assets, urls
+
+
+def check_bundle():
+    # the bundle starts with "/* app.jsx <hash> */" of the source it was built from
+    if not os.path.exists(FRONTEND_SOURCE):
+        return
+    with open(FRONTEND_SOURCE, "rb") as f:
+        expected = hashlib.sha256(f.read()).hexdigest()[:16]
+    with open(os.path.join(ASSET_FOLDER, "app.min.js"), encoding="utf-8") as f:
+        header = f.readline()
+    if expected not in header:
+        app.logger.warning("static/app.min.js is out of date with frontend/app.jsx; run python frontend/build.py")
+
+
+assets, asset_urls = load_assets()
+check_bundle()
+with app.app_context():
+    INDEX_HTML = render_template_string(HTML_TEMPLATE, scripts=[asset_urls[f] for f in ASSET_FILES])
+INDEX_ETAG = hashlib.sha1(INDEX_HTML.encode()).hexdigest()
 
-            // Validation rules
-            if (plotType === "pie chart" && x && y) {
-            setNote("Pie chart can only have one variable (choose either X or Y, not both).");
-            return;
-            }
 
-            if (plotType !== "pie chart" && !x && !y) {
-            setNote("Please select at least one variable for this plot type.");
-            return;
-            }
+# Flask endpoints
 
-            setLoadingPlot(true);
-            try {
-            const response = await fetch("/plot", {
-                method: "POST",
-                headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({ x, y, groupBy, plotType }),
-            });
-
-            if (!response.ok) {
-                const txt = await response.text();
-                alert("Plot error: " + txt);
-                return;
-            }
 
-            const blob = await response.blob();
-            setImgUrl(URL.createObjectURL(blob));
-            } catch (e) {
-            console.error(e);
-            } finally {
-            setLoadingPlot(false);
-            }
-        };
+@app.route("/")
+def index():
+    # the shell is tiny and rendered once; it is revalidated so a deploy
+    # picks up new asset hashes straight away
+    response = Response(INDEX_HTML, mimetype="text/html")
+    response.set_etag(INDEX_ETAG)
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+
+@app.route("/assets/<name>")
+def asset(name):
+    entry = assets.get(name)
+    if entry is None:
+        return "Unknown asset", 404
+    body, gzipped = entry
+    response = Response(body, mimetype="text/javascript")
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        response.set_data(gzipped)
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    # the name changes whenever the content does
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+# instrumentation: spans, request counters and opt-in profiling
+def _peak_rss():
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024   # kB on Linux
+
+
+def _observe(hist, seconds):
+    hist["count"] += 1
+    hist["sum"] += seconds
+    for k, bound in enumerate(METRIC_BUCKETS):
+        if seconds <= bound:
+            hist["buckets"][k] += 1
+
+
+def _histogram():
+    return {"count": 0, "sum": 0.0, "buckets": [0] * len(METRIC_BUCKETS)}
+
+
+def record_span(stage, seconds, rows=None, nbytes=None, heap_peak=None):
+    with metrics_lock:
+        stats = stage_stats.get(stage)
+        if stats is None:
+            stats = stage_stats[stage] = {**_histogram(), "rows": 0, "bytes": 0, "heap_peak": 0}
+        _observe(stats, seconds)
+        stats["rows"] += rows or 0
+        stats["bytes"] += nbytes or 0
+        if heap_peak:
+            stats["heap_peak"] = max(stats["heap_peak"], heap_peak)
+
+
+def _heap_mark(window=None):
+    # tracemalloc keeps one peak for the whole process: fold it into every
+    # open window before resetting it, so nested and concurrent spans each
+    # see the highest heap reached while they ran. returns the peak of
+    # the closed window above the heap it started at
+    with metrics_lock:
+        current, peak = tracemalloc.get_traced_memory()
+        for w in open_spans:
+            w["peak"] = max(w["peak"], peak)
+        tracemalloc.reset_peak()
+        if window is None:
+            open_spans.append({"start": current, "peak": current})
+            return open_spans[-1]
+        open_spans.remove(window)
+        return window["peak"] - window["start"]
+
+
+@contextlib.contextmanager
+def span(stage, rows=None, nbytes=None):
+    # times the block; counts can also be filled in on the yielded dict.
+    # with MSY_PROFILING=1 it also records how far the Python heap
+    # (tracemalloc, which sees numpy/pandas buffers) rose above its level
+    # at the start of the block
+    counts = {"rows": rows, "bytes": nbytes}
+    window = _heap_mark() if PROFILING and tracemalloc.is_tracing() else None
+    start = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        seconds = time.perf_counter() - start
+        heap_peak = _heap_mark(window) if window is not None else None
+        record_span(stage, seconds, counts["rows"], counts["bytes"], heap_peak)
 
-        // Results panel (unchanged)
-        const [showResultsPanel, setShowResultsPanel] = React.useState(false);
-        const [selectedDate, setSelectedDate] = React.useState("");
-        const [selectedModelTarget, setSelectedModelTarget] = React.useState("");
-        const [resultsImgUrl, setResultsImgUrl] = React.useState("");
-        const [explainedVar, setExplainedVar] = React.useState(null);
 
-        const handleDisplayResultsClick = () => setShowResultsPanel(true);
+def profile_requested():
+    return PROFILING and request.args.get("profile") == "1"
 
-        const handleShowResults = async () => {
-            if (!selectedDate || !selectedModelTarget) {
-            alert("Please choose a date and target.");
-            return;
-            }
 
-            setLoadingResults(true);
-            try {
-            const response = await fetch("/plot_results", {
-                method: "POST",
-                headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({ date: selectedDate, target: selectedModelTarget }),
-            });
-
-            if (!response.ok) {
-                const txt = await response.text();
-                alert("Error: " + txt);
-                return;
-            }
+def start_profile():
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None     # another profile is running (one at a time on 3.12+)
+    return profiler
+
+
+def dump_profile(profiler, name):
+    profiler.disable()
+    os.makedirs(PROFILE_FOLDER, exist_ok=True)
+    path = os.path.join(PROFILE_FOLDER, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.prof")
+    profiler.dump_stats(path)
+    return path
+
+
+@app.before_request
+def _start_request():
+    g.started = time.perf_counter()
+    # load jobs profile their own thread, see run_load_job
+    if profile_requested() and request.endpoint != "upload_file":
+        g.profiler = start_profile()
+
+
+@app.after_request
+def _finish_request(response):
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        response.headers["X-Profile"] = dump_profile(profiler, request.endpoint or "request")
+    started = g.pop("started", None)
+    if started is not None:
+        endpoint = request.endpoint or "unknown"
+        with metrics_lock:
+            key = (endpoint, request.method, response.status_code)
+            request_stats[key] = request_stats.get(key, 0) + 1
+            _observe(request_seconds.setdefault(endpoint, _histogram()), time.perf_counter() - started)
+    return response
+
+
+def _labels(**labels):
+    def escape(v):
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _histogram_lines(name, hist, **labels):
+    lines = []
+    for bound, count in zip(METRIC_BUCKETS, hist["buckets"]):
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist['count']}")
+    lines.append(f"{name}_sum{_labels(**labels)} {hist['sum']:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {hist['count']}")
+    return lines
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    with metrics_lock:
+        stages = {k: {**v, "buckets": list(v["buckets"])} for k, v in stage_stats.items()}
+        requests = dict(request_stats)
+        latencies = {k: {**v, "buckets": list(v["buckets"])} for k, v in request_seconds.items()}
+    with datasets_lock:
+        loaded = list(datasets.values())
+    with jobs_changed:
+        running = sum(job["state"] in ("queued", "running") for job in jobs.values())
+
+    lines = [
+        "# HELP msy_stage_seconds Time spent in each pipeline stage.",
+        "# TYPE msy_stage_seconds histogram",
+    ]
+    for stage, stats in sorted(stages.items()):
+        lines += _histogram_lines("msy_stage_seconds", stats, stage=stage)
+    for name, field, kind, text in (
+        ("msy_stage_rows_total", "rows", "counter", "Rows processed by each pipeline stage."),
+        ("msy_stage_bytes_total", "bytes", "counter", "Bytes read or produced by each pipeline stage."),
+        ("msy_stage_heap_peak_bytes", "heap_peak", "gauge",
+         "Largest rise of the traced Python heap above its starting level during one run "
+         "of the stage (tracemalloc; 0 unless MSY_PROFILING=1)."),
+    ):
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+        lines += [f"{name}{_labels(stage=stage)} {stats[field]}" for stage, stats in sorted(stages.items())]
+
+    lines += [
+        "# HELP msy_http_requests_total Requests served per endpoint, method and status.",
+        "# TYPE msy_http_requests_total counter",
+    ]
+    for (endpoint, method, status), count in sorted(requests.items()):
+        lines.append(f"msy_http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}")
+    lines += [
+        "# HELP msy_http_request_seconds Request latency per endpoint.",
+        "# TYPE msy_http_request_seconds histogram",
+    ]
+    for endpoint, hist in sorted(latencies.items()):
+        lines += _histogram_lines("msy_http_request_seconds", hist, endpoint=endpoint)
+
+    for name, value, text in (
+        ("msy_datasets_loaded", len(loaded), "Dataset versions held in memory."),
+        ("msy_datasets_bytes", sum(ds["bytes"] for ds in loaded), "Bytes held by loaded dataset versions."),
+        ("msy_plot_cache_entries", len(plot_cache), "Entries in the rendered plot cache."),
+        ("msy_result_cache_bytes", result_cache_held["bytes"], "Bytes held by the query and results cache."),
+        ("msy_load_jobs_active", running, "Load jobs queued or running."),
+        ("msy_process_peak_rss_bytes", _peak_rss(), "Peak resident set size of the server process."),
+    ):
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} gauge", f"{name} {value}"]
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+# on-disk cache of cleaned month pieces and merged frames (parquet)
+def _file_signature(path):
+    st = os.stat(path)
+    return f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+
+
+def _cache_key(paths):
+    h = hashlib.sha1(f"format-{CACHE_FORMAT}".encode())
+    for path in paths:
+        h.update(_file_signature(path).encode())
+    return h.hexdigest()[:16]
+
+
+def _cache_prefix(path):
+    # the file (or folder) name plus a hash of where it lives, so same-named
+    # files of two data folders keep separate entries
+    where = hashlib.sha1(os.path.dirname(os.path.abspath(path)).encode()).hexdigest()[:8]
+    return re.sub(r"[^A-Za-z0-9]+", "_", os.path.basename(os.path.abspath(path))).strip("_") + "_" + where
+
+
+def _read_cached(stem, names):
+    paths = [os.path.join(CACHE_FOLDER, f"{stem}-{name}.parquet") for name in names]
+    if not all(os.path.exists(p) for p in paths):
+        return None
+    try:
+        return [pd.read_parquet(p) for p in paths]
+    except Exception as e:
+        app.logger.warning("Ignoring unreadable cache entry %s: %s", stem, e)
+        return None
 
-            const data = await response.json();
-            if (!data.image) {
-                alert("No image returned from server.");
-                return;
-            }
 
-            setResultsImgUrl("data:image/png;base64," + data.image);
-            setMse(typeof data.mse === "number" ? data.mse.toFixed(4) : "N/A");
-            setVar(typeof data.variance === "number" ? data.variance.toFixed(4) : "N/A");
-            setExplainedVar(
-                typeof data.explained_variance === "number"
-                ? data.explained_variance.toFixed(4)
-                : "N/A"
-            );
-            } catch (e) {
-            console.error(e);
-            } finally {
-            setLoadingResults(false);
-            }
-        };
-
-        return (
-            <div>
-            <h2>Graphing</h2>
-
-            {!modelBuilt && (
-                <>
-                <div>
-                    <label>Group By: </label>
-                    <select value={groupBy} onChange={(e) => setGroupBy(e.target.value)}>
-                    <option value="">--Select--</option>
-                    <option value="Group">Group</option>
-                    <option value="Category">Category</option>
-                    <option value="Item">Item</option>
-                    </select>
-                </div>
-
-                {groupBy && (
-                    <>
-                    <div style={{ marginTop: 10 }}>
-                        <label>Plot Type: </label>
-                        <select value={plotType} onChange={(e) => setPlotType(e.target.value)}>
-                        <option value="barplot">Barplot</option>
-                        <option value="scatterplot">Scatterplot</option>
-                        <option value="line plot">Line Plot</option>
-                        <option value="pie chart">Pie Chart</option>
-                        </select>
-                    </div>
-
-                    <div style={{ marginTop: 10 }}>
-                        <label>X: </label>
-                        <select value={x} onChange={(e) => setX(e.target.value)}>
-                        <option value="">--Select--</option>
-                        {columnOptions.map((col) => (
-                            <option key={col} value={col}>
-                            {col}
-                            </option>
-                        ))}
-                        </select>
-
-                        <label> Y: </label>
-                        <select value={y} onChange={(e) => setY(e.target.value)}>
-                        <option value="">--Select--</option>
-                        {columnOptions.map((col) => (
-                            <option key={col} value={col}>
-                            {col}
-                            </option>
-                        ))}
-                        </select>
-                    </div>
-                    </>
-                )}
-
-                {note && (
-                    <div style={{ marginTop: "8px", color: "darkorange", fontWeight: "bold" }}>
-                    {note}
-                    </div>
-                )}
-
-                <div style={{ marginTop: "10px" }}>
-                    <button onClick={handlePlot} disabled={loadingPlot || !groupBy}>
-                    {loadingPlot ? "Plotting..." : "Generate Plot"}
-                    </button>
-                </div>
-
-                {imgUrl && (
-                    <div style={{ marginTop: "20px" }}>
-                    <img src={imgUrl} alt="Plot" style={{ maxWidth: "100%" }} />
-                    </div>
-                )}
-                </>
-            )}
-
-            {modelBuilt && (
-                <div style={{ marginTop: 10 }}>
-                <button onClick={handleDisplayResultsClick}>Display Results</button>
-                </div>
-            )}
-
-            {modelBuilt && showResultsPanel && (
-                <div style={{ marginTop: 12 }}>
-                <div>
-                    <label>Date: </label>
-                    <input
-                    type="date"
-                    value={selectedDate}
-                    onChange={(e) => setSelectedDate(e.target.value)}
-                    />
-                    <label> Target: </label>
-                    <select
-                    value={selectedModelTarget}
-                    onChange={(e) => setSelectedModelTarget(e.target.value)}
-                    >
-                    <option value="">--Select--</option>
-                    {modelTargets.map((t, i) => (
-                        <option key={i} value={t}>
-                        {t}
-                        </option>
-                    ))}
-                    </select>
-                    <button
-                    onClick={handleShowResults}
-                    disabled={loadingResults}
-                    style={{ marginLeft: 10 }}
-                    >
-                    {loadingResults ? "Plotting..." : "Show Results"}
-                    </button>
-                </div>
-
-                {resultsImgUrl && (
-                    <div
-                    style={{
-                        display: "flex",
-                        alignItems: "flex-start",
-                        marginTop: 16,
-                        gap: "2rem",
-                    }}
-                    >
-                    <img src={resultsImgUrl} alt="Results" style={{ maxWidth: "65%" }} />
-                    <div style={{ fontSize: "1rem", lineHeight: "1.6" }}>
-                        <strong>MSE:</strong> {mse}
-                        <br />
-                        <strong>Variance:</strong> {varVal}
-                        <br />
-                        <strong>Explained Variance:</strong> {explainedVar}
-                    </div>
-                    </div>
-                )}
-                </div>
-            )}
-            </div>
-        );
-    };
-
-
-
-
-    // Application
-    const App = () => {
-      const [activeTab, setActiveTab] = React.useState("File Upload");
-      const [columnNames, setColumnNames] = React.useState([]);
-      const [targetVariable, setTargetVariable] = React.useState("");
-      const [modelBuilt, setModelBuilt] = React.useState(false);
-      const [modelTargets, setModelTargets] = React.useState([]);
-
-
-      const handleModelBuilt = (targets) => {
-        setModelBuilt(true);
-        setModelTargets(targets || []);
-
-
-        setActiveTab("Graphing");
-      };
-
-
-      return (
-        <div>
-          <div className="top-bar">
-            <div>
-              <button onClick={() => setActiveTab("File Upload")}>File Upload</button>
-              <button onClick={() => setActiveTab("Graphing")}>Graphing</button>
-            </div>
-            <div>
-              {/* could show modelBuilt indicator */}
-              {modelBuilt ? <strong>Model built</strong> : null}
-            </div>
-          </div>
-
-
-          <div style={{ padding: 12 }}>
-            {activeTab === "File Upload" && (
-              <FileUpload setColumnNames={setColumnNames} setTargetVariable={setTargetVariable} />
-            )}
-            {activeTab === "Graphing" && (
-              <Graphing columnNames={columnNames} modelBuilt={modelBuilt} modelTargets={modelTargets} />
-            )}
-          </div>
-        </div>
-      );
-    };
-
-
-    ReactDOM.render(<App />, document.getElementById('root'));
-  </script>
-  {% endraw %}
-</body>
-</html>
-"""
+def _prune_cached(prefix, stem):
+    # drop stale entries for the same source before writing the new ones
+    for fname in os.listdir(CACHE_FOLDER):
+        if fname.startswith(prefix) and not fname.startswith(stem + "-"):
+            os.remove(os.path.join(CACHE_FOLDER, fname))
 
 
-# Flask endpoints
+def _write_cached(stem, frames):
+    _prune_cached(stem.rsplit("-", 1)[0] + "-", stem)
+    try:
+        for name, df in frames.items():
+            df.to_parquet(os.path.join(CACHE_FOLDER, f"{stem}-{name}.parquet"))
+    except Exception as e:
+        app.logger.warning("Could not cache %s: %s", stem, e)
 
 
-@app.route("/")
-def index():
-    return render_template_string(HTML_TEMPLATE)
+NOT_NUMERIC = r"[^0-9.\-]"
+CURRENCY_MARKS = ("$", ",", " ")
 
 
-@app.route("/upload", methods=["POST"])
-def upload_file():
-    global group, category, item
+def _strip_numeric(col):
+    # general path: drop every character that can't be part of a number
+    return pd.to_numeric(col.astype(str).str.replace(NOT_NUMERIC, "", regex=True), errors="coerce")
+
 
+def _strip_currency(col):
+    # fast path for "$1,234.56": literal Arrow replaces instead of a regex per
+    # cell; only the few cells with anything else left go through the regex
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    values = pa.array(col.astype(str), type=pa.string(), mask=col.isna().to_numpy())
+    for mark in CURRENCY_MARKS:
+        values = pc.replace_substring(values, mark, "")
+    stray = pc.fill_null(pc.match_substring_regex(values, NOT_NUMERIC), False)
+    if pc.any(stray).as_py():
+        cleaned = pc.replace_substring_regex(pc.filter(values, stray), NOT_NUMERIC, "")
+        values = pc.replace_with_mask(values, stray, cleaned)
+    values = pc.if_else(pc.equal(values, ""), None, values)
     try:
-        import re
-
-        # loading excel files
-        months = [
-            "data/May_Data_Matrix (1).xlsx",
-            "data/June_Data_Matrix.xlsx",
-            "data/July_Data_Matrix (1).xlsx",
-            "data/August_Data_Matrix (1).xlsx",
-            "data/September_Data_Matrix.xlsx",
-            "data/October_Data_Matrix_20251103_214000.xlsx",
-        ]
-
-        dfs = []
-        for fpath in months:
-            for sheet_idx in range(3):
-                df = pd.read_excel(fpath, sheet_name=sheet_idx)
-                df["month"] = (
-                    os.path.basename(fpath).split("_")[0]
-                    .replace("Data", "")
-                    .strip()
-                )
-                dfs.append(df)
-
-        # splitting into categories
-        group_dfs, category_dfs, item_dfs = [], [], []
-        for df in dfs:
-            cols = df.columns
-            if "Group" in cols:
-                group_dfs.append(df)
-            elif "Category" in cols:
-                category_dfs.append(df)
-            else:
-                item_dfs.append(df)
-
-        group = pd.concat(group_dfs, ignore_index=True)
-        category = pd.concat(category_dfs, ignore_index=True)
-        item = pd.concat(item_dfs, ignore_index=True)
-
-        group["type"] = "Group"
-        category["type"] = "Category"
-        item["type"] = "Specific Item"
-
-        # numeric conversions and cost calculation
-        for df in [group, category, item]:
-            for col in ["Amount", "Count"]:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(
-                        df[col]
-                        .astype(str)
-                        .str.replace(r"[^0-9.\-]", "", regex=True),
-                        errors="coerce",
+        numbers = pc.cast(values, pa.float64()).to_numpy(zero_copy_only=False)
+    except pa.ArrowInvalid:
+        # stray dots or dashes ("1.2.3", "-"): coerce those to NaN like the general path
+        return pd.to_numeric(values.to_pandas(), errors="coerce").set_axis(col.index)
+    # to_numeric keeps text without a decimal point ("1,234", "12") as
+    # integers and "$1,234.00" as float; same dtype with or without pyarrow
+    if values.null_count == 0 and not pc.any(pc.match_substring(values, ".")).as_py():
+        numbers = numbers.astype("int64")
+    return pd.Series(numbers, index=col.index, name=col.name)
+
+
+def to_number(col):
+    # columns the workbook already typed are left alone; only text is cleaned
+    if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col):
+        return col
+    if ARROW_STRINGS and col.dtype == object:
+        return _strip_currency(col)
+    return _strip_numeric(col)
+
+
+def unit_cost(amount, count):
+    # Amount / Count, 0 where there is no count (instead of inf) or no amount
+    amount = np.asarray(amount, dtype="float64")
+    count = np.asarray(count, dtype="float64")
+    cost = np.divide(amount, count, out=np.zeros(len(amount)), where=count != 0)
+    return np.nan_to_num(cost, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def clean_frame(df, kind):
+    df["type"] = kind
+
+    # numeric conversions and cost calculation
+    for col in ["Amount", "Count"]:
+        if col in df.columns:
+            df[col] = to_number(df[col])
+    df["cost"] = unit_cost(df["Amount"] if "Amount" in df.columns else np.zeros(len(df)),
+                           df["Count"] if "Count" in df.columns else np.ones(len(df)))
+    return df
+
+
+def read_workbook(fpath):
+    # one open per workbook; sheets come back in workbook order
+    start = time.perf_counter()
+    sheets = pd.read_excel(fpath, sheet_name=None, engine=EXCEL_ENGINE)
+    return list(sheets.values())[:3], time.perf_counter() - start
+
+
+def build_month(fpath):
+    dfs, read_seconds = read_workbook(fpath)
+    month = os.path.basename(fpath).split("_")[0].replace("Data", "").strip()
+    for df in dfs:
+        df["month"] = month
+
+    # splitting into categories
+    start = time.perf_counter()
+    pieces = {"group": [], "category": [], "item": []}
+    for df in dfs:
+        cols = df.columns
+        if "Group" in cols:
+            pieces["group"].append(clean_frame(df, "Group"))
+        elif "Category" in cols:
+            pieces["category"].append(clean_frame(df, "Category"))
+        else:
+            pieces["item"].append(clean_frame(df, "Specific Item"))
+
+    frames = {
+        name: pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+        for name, parts in pieces.items()
+    }
+    # timed here because months are usually built in worker processes
+    return frames, {"read": read_seconds, "clean": time.perf_counter() - start}
+
+
+def load_months(paths, progress=None):
+    # cached months come straight from parquet, the rest are read in parallel;
+    # progress(done, total) is called as months become available
+    results = [None] * len(paths)
+    stems = [f"{_cache_prefix(p)}-{_cache_key([p])}" for p in paths]
+    missing = []
+    for i, stem in enumerate(stems):
+        results[i] = _read_cached(stem, ["group", "category", "item"])
+        if results[i] is None:
+            missing.append(i)
+
+    def store(i, frames, timings):
+        app.logger.info("Read %s in %.3fs", paths[i], timings["read"])
+        rows = sum(len(df) for df in frames.values())
+        record_span("load.read_workbook", timings["read"], rows, os.path.getsize(paths[i]))
+        record_span("load.clean_numeric", timings["clean"], rows)
+        _write_cached(stems[i], frames)
+        results[i] = [frames["group"], frames["category"], frames["item"]]
+        if progress:
+            progress(sum(r is not None for r in results), len(paths))
+
+    if progress:
+        progress(len(paths) - len(missing), len(paths))
+    if len(missing) > 1 and INGEST_WORKERS > 1:
+        workers = min(len(missing), INGEST_WORKERS)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=PROCESS_CONTEXT) as pool:
+            futures = {pool.submit(build_month, paths[i]): i for i in missing}
+            for future in as_completed(futures):
+                store(futures[future], *future.result())
+    else:
+        for i in missing:
+            store(i, *build_month(paths[i]))
+    return results
+
+
+# canonical names shared by every merge: item names, recipe columns and
+# shipment ingredients are normalized (memoized, bounded) and joined on ids.
+# ids come from an index dict owned by the caller, so they are only
+# comparable within one merge and nothing outlives it
+CANONICAL_CACHE_SIZE = 65536
+
+
+@functools.lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonical_name(name):
+    # "Braised Beef used (g)" -> "braised beef"; plural "s" dropped per word
+    name = re.sub(r"\([^)]*\)", " ", str(name).lower())
+    words = [w for w in re.split(r"[^a-z0-9]+", name) if w and w != "used"]
+    return " ".join(
+        w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+        for w in words
+    )
+
+
+def name_ids(values, index):
+    # vectorized: each distinct raw string is normalized once, then mapped
+    # to the integer id of its canonical name in index (filled as needed)
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object).astype(str))
+    ids = np.empty(len(uniques), dtype=np.int64)
+    for k, raw in enumerate(uniques):
+        ids[k] = index.setdefault(canonical_name(raw), len(index))
+    return ids[codes]
+
+
+def id_names(ids, index):
+    names = np.empty(len(index), dtype=object)
+    for name, i in index.items():
+        names[i] = name
+    return names[np.asarray(ids)]
+
+
+def match_ingredient(words, candidates):
+    # exact name, else the one candidate containing every word and sharing
+    # the head noun ("beef" -> "braised beef", but "egg" never -> "eggplant")
+    exact = [j for j, c in enumerate(candidates) if c == words]
+    if exact:
+        return exact
+    loose = [
+        j for j, c in enumerate(candidates)
+        if words and c and set(words) <= set(c) and c[-1] == words[-1]
+    ]
+    return loose if len(loose) == 1 else []
+
+
+def ingredient_resolver(columns):
+    # maps an ingredient name to the positions of the recipe columns it
+    # refers to; each distinct canonical name is resolved once
+    candidates = [tuple(canonical_name(c).split()) for c in columns]
+    resolved = {}
+
+    def resolve(name):
+        key = canonical_name(name)
+        if key not in resolved:
+            resolved[key] = match_ingredient(tuple(key.split()), candidates)
+        return resolved[key]
+
+    return resolve
+
+
+def split_ingredient(name):
+    return [p for p in re.split(r"\s*\+\s*", str(name)) if p]
+
+
+def _text_to_float(col):
+    # parsed text -> float64 with stray cells as NaN; the plain cast is much
+    # faster and only a column holding something else pays for the coercion
+    try:
+        return col.astype("float64")
+    except ValueError:
+        return pd.to_numeric(col, errors="coerce").astype("float64")
+
+
+def read_shipments(path, chunksize=None):
+    # only the columns we use, one chunk at a time
+    header = pd.read_csv(path, nrows=0)
+    dtypes = {_find_column(header, keyword): dtype for keyword, dtype in SHIPMENT_FIELDS.items()}
+    numeric = [column for column, dtype in dtypes.items() if dtype == "float64"]
+    reader = pd.read_csv(path, usecols=list(dtypes), dtype=str, chunksize=chunksize or SHIPMENT_CHUNK_ROWS)
+
+    def chunks():
+        for chunk in reader:
+            for column in numeric:
+                chunk[column] = _text_to_float(chunk[column])
+            yield chunk
+    return chunks()
+
+
+def shipment_lines(chunks, keep=None):
+    # one line per ingredient, quantity, unit and frequency with the number
+    # of shipments summed, folded in chunk by chunk so memory follows the
+    # number of distinct lines rather than the file size.
+    # keep(chunk) -> boolean mask of the rows to use
+    total = None
+    for chunk in chunks:
+        if keep is not None:
+            chunk = chunk[keep(chunk)]
+        total = chunk if total is None else pd.concat([total, chunk], ignore_index=True)
+        number = _find_column(total, "number")
+        keys = [c for c in total.columns if c != number]
+        # a line without a count is one shipment, as in monthly_shipments
+        total = (
+            total.fillna({number: 1})
+            .groupby(keys, sort=False, dropna=False, as_index=False)[number].sum()
+            [list(chunk.columns)]
+        )
+    return total
+
+
+def match_shipment_rows(columns, chunks):
+    # shipment lines whose ingredient (or any part of "A + B") is one of the
+    # recipe columns; names are resolved once however many chunks repeat them
+    resolve = ingredient_resolver(columns)
+    known = {}
+
+    def keep(chunk):
+        codes, names = pd.factorize(chunk[_find_column(chunk, "ingredient")].astype(str))
+        for name in names:
+            if name not in known:
+                parts = split_ingredient(name)
+                known[name] = any(resolve(p) for p in parts)
+                if not known[name]:
+                    app.logger.warning(
+                        "No matching column found for ingredient(s): %s", [canonical_name(p) for p in parts]
                     )
-            df["cost"] = (df.get("Amount", 0) / df.get("Count", 1)).fillna(0)
+        return np.array([known[n] for n in names], dtype=bool)[codes]
 
-        # loading ingredient and shipment data
-        ing = pd.read_csv("data/MSY Data - Ingredient.csv")
-        ship = pd.read_csv("data/MSY Data - Shipment.csv")
+    ship = shipment_lines(chunks, keep)
+    if ship is None or ship.empty:
+        return None
+    return ship
+
+
+def month_name(fpath):
+    return os.path.basename(fpath).split("_")[0].replace("Data", "").strip()
+
+
+def data_source(name, folder):
+    return {
+        "name": name,
+        "folder": folder,
+        "ingredients": os.path.join(folder, "MSY Data - Ingredient.csv"),
+        "shipments": os.path.join(folder, "MSY Data - Shipment.csv"),
+    }
 
-        # merging items and ingredients
-        item["Item Name"] = item["Item Name"].astype(str)
-        ing["Item name"] = ing["Item name"].astype(str)
-
-        item_ing = pd.merge(
-            item,
-            ing,
-            left_on=item["Item Name"].str.strip().str.lower(),
-            right_on=ing["Item name"].str.strip().str.lower(),
-            how="outer",
-            suffixes=("_item", "_ing"),
-        )
 
-        item_ing.rename(
-            columns={"Item name": "Items with Ingredient Counts"}, inplace=True
+def discover_months(folder):
+    # monthly workbooks in calendar order (e.g. May_Data_Matrix (1).xlsx)
+    def order(fpath):
+        try:
+            number = datetime.strptime(month_name(fpath), "%B").month
+        except ValueError:
+            number = 13
+        return number, os.path.basename(fpath)
+
+    return sorted(glob.glob(os.path.join(folder, "*_Data_Matrix*.xlsx")), key=order)
+
+
+def merge_item_rows(items, ing):
+    # item rows with their recipe columns, joined on canonical name ids;
+    # ingredient-only rows are added later by assemble_item so months can
+    # be merged one at a time
+    items["Item Name"] = items["Item Name"].astype(str)
+    name_index = {}
+    merged = pd.merge(
+        items,
+        ing,
+        left_on=name_ids(items["Item Name"], name_index),
+        right_on=name_ids(ing["Item name"], name_index),
+        how="left",
+        suffixes=("_item", "_ing"),
+    )
+    merged["key_0"] = id_names(merged["key_0"], name_index)
+    merged.rename(
+        columns={"Item name": "Items with Ingredient Counts"}, inplace=True
+    )
+    merged.columns = merged.columns.str.strip()
+    return merged
+
+
+def assemble_item(item_rows, ing, ship_rows):
+    # same rows and order as an outer item/ingredient merge, followed by
+    # the matched shipment rows
+    name_index = {}
+    ids = name_ids(ing["Item name"], name_index)
+    sold = np.isin(ids, name_ids(item_rows["key_0"], name_index))
+    ing_only = ing[~sold].rename(
+        columns={"Item name": "Items with Ingredient Counts"}
+    )
+    ing_only.columns = ing_only.columns.str.strip()
+    ing_only.insert(0, "key_0", id_names(ids[~sold], name_index))
+
+    item_ing = pd.concat([item_rows, ing_only], ignore_index=True)
+    item_ing = item_ing.sort_values("key_0", kind="mergesort", ignore_index=True)
+
+    if ship_rows is not None:
+        item_ing = pd.concat([item_ing, ship_rows], axis=0, ignore_index=True)
+    item_ing.fillna({"cost": 0}, inplace=True)
+    return item_ing
+
+
+def optimize_frame(df, sparse_columns=()):
+    # repeated strings -> category, numbers -> the smallest lossless dtype,
+    # mostly-empty recipe columns -> sparse
+    out = {}
+    for name, col in df.items():
+        if name in sparse_columns and pd.api.types.is_numeric_dtype(col):
+            if isinstance(col.dtype, pd.SparseDtype):
+                col = col.sparse.to_dense()
+            if col.isna().mean() > 0.5:
+                dense = _downcast(col)
+                out[name] = pd.arrays.SparseArray(dense, fill_value=np.nan)
+                continue
+        if col.dtype == object or isinstance(col.dtype, pd.CategoricalDtype):
+            if pd.api.types.infer_dtype(col, skipna=True) == "string" and col.nunique() <= len(col) / 2:
+                out[name] = col.astype("category")
+            else:
+                out[name] = col.astype(object)
+        elif pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col):
+            out[name] = _downcast(col)
+        else:
+            out[name] = col
+    return pd.DataFrame(out, index=df.index)
+
+
+def _downcast(col):
+    if pd.api.types.is_integer_dtype(col):
+        return pd.to_numeric(col, downcast="integer")
+    if pd.api.types.is_float_dtype(col) and col.dtype != np.float32:
+        # only when every value survives the round trip (counts, not currency)
+        small = col.astype(np.float32)
+        if np.array_equal(small.to_numpy(np.float64), col.to_numpy(np.float64), equal_nan=True):
+            return small
+    return col
+
+
+def memory_usage(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def held_bytes(obj):
+    # resident size of what a dataset version holds: frames, arrays and the
+    # dicts and lists around them (strings inside object arrays included)
+    if isinstance(obj, pd.DataFrame):
+        return memory_usage(obj)
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return obj.nbytes + sum(sys.getsizeof(v) for v in obj.ravel())
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(held_bytes(k) + held_bytes(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(held_bytes(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+def compact_frames(frames):
+    # returns the report; frames is updated with the compacted copies
+    sparse_columns = set(recipe_columns(frames["ing"]))
+    report = {}
+    for name in ("group", "category", "item"):
+        before = memory_usage(frames[name])
+        frames[name] = optimize_frame(frames[name], sparse_columns)
+        report[name] = {"before": before, "after": memory_usage(frames[name])}
+        app.logger.info(
+            "%s frame: %.1f KiB -> %.1f KiB", name, before / 1024, report[name]["after"] / 1024
         )
-        item_ing.columns = item_ing.columns.str.strip()
+    frames["item_rows"] = optimize_frame(frames["item_rows"], sparse_columns)
+    return report
+
+
+def build_usage_cube(item_df, ing_df):
+    # dense month x ingredient usage, computed once per load as a single
+    # matrix multiply: item counts per month (months x items) times the
+    # recipe table (items x ingredients)
+    items = plot_columns(item_df, ["key_0", "month", "Count", "type"])
+    items = items[(items["type"] == "Specific Item") & items["month"].map(month_start).notna()]
+    name_index = {}
+    counts = items.pivot_table(
+        index="month", columns=name_ids(items["key_0"], name_index), values="Count", aggfunc="sum", fill_value=0
+    )
+    months = sorted(counts.index, key=month_start)
+    counts = counts.loc[months]
+
+    names = [c for c in ing_df.columns if c != "Item name"]
+    recipe = ing_df[names].apply(pd.to_numeric, errors="coerce").fillna(0)
+    recipe.columns = [c.strip() for c in names]
+    recipe = recipe.groupby(name_ids(ing_df["Item name"], name_index)).sum()
+
+    common = counts.columns.intersection(recipe.index)
+    matrix = counts[common].to_numpy(dtype=float) @ recipe.loc[common].to_numpy(dtype=float)
+    ingredients = list(recipe.columns)
+    return {
+        "months": months,
+        "dates": [month_start(m) for m in months],
+        "ingredients": ingredients,
+        "month_index": {m.lower(): i for i, m in enumerate(months)},
+        "ingredient_index": {canonical_name(name): j for j, name in enumerate(ingredients)},
+        "matrix": matrix,
+    }
 
-        # helper function to normalize text
-        def normalize_text(s):
-            if isinstance(s, str):
-                s = s.strip().lower()
-                s = re.sub(r"[^a-z]+$", "", s)
-                return s
-            return s
 
-        normalized_columns = [normalize_text(col) for col in item_ing.columns]
+def build_rankings(item_df, ing_df):
+    # per-month and overall totals per item with their argsorts, plus a
+    # sparse item x ingredient matrix for co-occurrence counts
+    items = plot_columns(item_df, ["key_0", "Item Name", "month", "Count", "Amount", "type"])
+    items = items[items["type"] == "Specific Item"]
+    name_index = {}
+    item_ids = name_ids(items["key_0"], name_index)
+    codes, unique_ids = pd.factorize(item_ids)
+    names = items.groupby(codes, sort=True)["Item Name"].first().to_numpy(dtype=object)
+
+    ingredients = recipe_columns(ing_df)
+    recipe = ing_df.drop(columns="Item name").apply(pd.to_numeric, errors="coerce").fillna(0)
+    recipe_rows = pd.Series(np.arange(len(ing_df)), index=name_ids(ing_df["Item name"], name_index))
+    recipe_rows = recipe_rows[~recipe_rows.index.duplicated()]
+    rows = recipe_rows.reindex(unique_ids).to_numpy()
+    uses = np.zeros((len(unique_ids), len(ingredients)), dtype=bool)
+    has_recipe = ~np.isnan(rows)
+    uses[has_recipe] = recipe.to_numpy()[rows[has_recipe].astype(int)] > 0
+
+    def period(mask):
+        totals = pd.DataFrame({
+            "row": codes[mask],
+            "Count": items["Count"].to_numpy(dtype=float)[mask],
+            "Amount": items["Amount"].to_numpy(dtype=float)[mask],
+        }).groupby("row").sum()
+        count = totals["Count"].to_numpy()
+        amount = totals["Amount"].to_numpy()
+        return {
+            "rows": totals.index.to_numpy(),
+            "Count": count,
+            "Amount": amount,
+            "order": {
+                "Count": np.argsort(-count, kind="stable"),
+                "Amount": np.argsort(-amount, kind="stable"),
+            },
+        }
+
+    months = items["month"].to_numpy(dtype=object)
+    periods = {"overall": period(np.ones(len(items), dtype=bool))}
+    for month in pd.unique(months):
+        periods[str(month).lower()] = period(months == month)
+    return {
+        "names": names,
+        "ingredients": ingredients,
+        # compressed rows: item r uses ingredients indices[indptr[r]:indptr[r + 1]]
+        "indptr": np.concatenate([[0], np.cumsum(uses.sum(axis=1))]),
+        "indices": np.nonzero(uses)[1],
+        "periods": periods,
+    }
 
-        # merging shipment data
-        ship_copy = ship.copy()
-        ship_copy["Ingredient"] = ship_copy["Ingredient"].astype(str)
 
-        def expand_ingredient(ing_name):
-            parts = re.split(r"\s*\+\s*", ing_name)
-            return [normalize_text(p) for p in parts if p]
+def query_key(column, value):
+    # filter values and indexed values compare alike: months in calendar
+    # order, names case-insensitively
+    if column == "month":
+        start = month_start(value)
+        return None if start is None else start.month
+    return str(value).strip().lower()
+
+
+def build_column_index(col, column):
+    # rows grouped by sorted key, in the same compressed layout as the
+    # rankings: rows with the k-th smallest key are order[indptr[k]:indptr[k + 1]].
+    # codes holds each row's key rank (-1 where the key is missing) for sorting
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        # key each category once rather than every row
+        keys = pd.Series([query_key(column, v) for v in col.cat.categories], dtype=object)
+        row_keys = keys.take(col.cat.codes.to_numpy()).to_numpy()
+        row_keys[col.cat.codes.to_numpy() < 0] = None
+    else:
+        row_keys = np.asarray([None if pd.isna(v) else query_key(column, v) for v in col], dtype=object)
+    codes, uniques = pd.factorize(pd.Series(row_keys, dtype=object), sort=True)
+    order = np.argsort(codes, kind="stable")
+    order = order[np.count_nonzero(codes < 0):]   # missing keys never match a filter
+    return {
+        "keys": uniques.to_numpy(),
+        "indptr": np.concatenate([[0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))]),
+        "order": order,
+        "codes": codes,
+    }
 
-        merged = item_ing.copy()
 
-        for _, row in ship_copy.iterrows():
-            ingredients = expand_ingredient(row["Ingredient"])
-            matched = False
+def build_query_index(frames):
+    return {
+        name: {
+            column: build_column_index(frames[name][column], column)
+            for column in QUERY_FILTERS.values() if column in frames[name].columns
+        }
+        for name in GROUP_FRAMES.values()
+    }
 
-            for ingredient in ingredients:
-                matching_cols = [
-                    col for col in normalized_columns if ingredient in col and ingredient != ""
-                ]
-                if matching_cols:
-                    ship_rows = ship_copy[
-                        ship_copy["Ingredient"].str.lower().str.contains(ingredient, na=False)
-                    ]
-                    merged = pd.concat([merged, ship_rows], axis=0, ignore_index=True)
-                    matched = True
 
-            if not matched:
-                print(f"No matching column found for ingredient(s): {ingredients}")
+def usage_frame(cube):
+    return pd.DataFrame(cube["matrix"], index=cube["dates"], columns=cube["ingredients"])
+
+
+def plot_columns(df, columns):
+    # plotting code sees plain dense columns, so seaborn keeps its usual
+    # level order and never draws unused categories. float32 is only a
+    # storage format (every stored value is exact); arithmetic runs in
+    # float64 so means and sums don't pick up float32 rounding
+    out = {}
+    for name in dict.fromkeys(c for c in columns if c):
+        col = df[name]
+        if isinstance(col.dtype, pd.SparseDtype):
+            col = col.sparse.to_dense()
+        elif isinstance(col.dtype, pd.CategoricalDtype):
+            col = col.astype(object)
+        if col.dtype == np.float32:
+            col = col.astype(np.float64)
+        out[name] = col
+    return pd.DataFrame(out, index=df.index)
+
+
+def recipe_columns(ing_df):
+    return [c.strip() for c in ing_df.columns if c != "Item name"]
+
+
+def read_ingredients(path):
+    # the recipe table is needed whole; amounts are parsed as text and made
+    # numeric afterwards, so a stray cell ("-") is a missing amount
+    ing = pd.read_csv(path, dtype=str)
+    for column in ing.columns.drop("Item name"):
+        ing[column] = _text_to_float(ing[column])
+    ing["Item name"] = ing["Item name"].astype(str)
+    return ing
+
+
+def _record_sources(paths, sources):
+    now = time.time()
+    for fpath in paths:
+        st = os.stat(fpath)
+        sources[fpath] = {
+            "month": month_name(fpath) if fpath.endswith(".xlsx") else None,
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            "loaded_at": now,
+        }
+    return sources
+
+
+def _publish(frames, sources, source, job=None):
+    # compacts the frames, derives everything the endpoints need, then swaps
+    # the new version in; readers holding the previous version are unaffected
+    job_stage(job, "publishing")
+    with span("load.compact", rows=len(frames["item"])):
+        report = compact_frames(frames)
+    with span("load.usage_cube"):
+        cube = build_usage_cube(frames["item"], frames["ing"])
+    with span("load.rankings"):
+        ranks = build_rankings(frames["item"], frames["ing"])
+    with span("load.query_index", rows=len(frames["item"])):
+        query_index = build_query_index(frames)
+    ds = dict(
+        frames,
+        version=f"{source['name']}@{_cache_key(sorted(sources))}",
+        name=source["name"],
+        source=source,
+        sources=sources,
+        memory=report,
+        usage_cube=cube,
+        rankings=ranks,
+        query_index=query_index,
+        models=None,
+        models_error=None,
+        loaded_at=time.time(),
+    )
+    # everything the version holds; its models are added once they are fitted
+    ds["bytes"] = sum(held_bytes(value) for key, value in ds.items() if key != "models")
+    register_dataset(ds)
+    start_model_build(ds)
+    return ds
+
+
+def register_dataset(ds):
+    global current_version
+    with datasets_lock:
+        previous = datasets.pop(ds["version"], None)
+        if previous is not None and previous["models"] is not None:
+            ds["models"] = previous["models"]   # same sources, same fit
+            ds["bytes"] += held_bytes(ds["models"])
+        datasets[ds["version"]] = ds
+        latest_versions[ds["name"]] = ds["version"]
+        current_version = ds["version"]
+        evicted = _evict_over_budget()
+    _dropped(evicted)
+
+
+def charge_dataset(ds, nbytes):
+    # memory a version takes on after it was published (its fitted models)
+    with datasets_lock:
+        ds["bytes"] += nbytes
+        evicted = _evict_over_budget() if ds["version"] in datasets else []
+    _dropped(evicted)
+
+
+def _evict_over_budget():
+    # called with datasets_lock held. Least recently used versions go first,
+    # superseded ones before the latest of each name; the most recent load
+    # always stays
+    evicted = []
+    total = sum(d["bytes"] for d in datasets.values())
+    latest = set(latest_versions.values())
+    for version in [v for v in datasets if v not in latest] + [v for v in datasets if v in latest]:
+        if total <= DATASET_BUDGET:
+            break
+        if version != current_version:
+            gone = datasets.pop(version)
+            total -= gone["bytes"]
+            if latest_versions.get(gone["name"]) == version:
+                del latest_versions[gone["name"]]
+            evicted.append(version)
+    return evicted
+
+
+def _dropped(evicted):
+    if evicted:
+        app.logger.info("Evicted dataset(s) %s to stay within budget", ", ".join(evicted))
+        plot_cache_drop(evicted)
+        result_cache_drop(evicted)
+
+
+def get_dataset(ref=None):
+    # ref is a dataset name (its latest version) or a full version
+    with datasets_lock:
+        ds = datasets.get(latest_versions.get(ref, ref) if ref else current_version)
+        if ds is not None:
+            datasets.move_to_end(ds["version"])
+        return ds
+
+
+def requested_version():
+    req = request.get_json(silent=True) if request.is_json else None
+    return (req or {}).get("dataset") or request.args.get("dataset")
+
+
+def request_dataset():
+    return get_dataset(requested_version())
+
+
+def no_dataset():
+    version = requested_version()
+    if version:
+        return f"Unknown or evicted dataset '{version}'", 404
+    return "No data loaded", 409
+
+
+def upload_source(req):
+    # the named source an /upload loads: ?name= (default "default") and
+    # ?folder=, which may be left out to reload a name from its last folder
+    name = req.get("name") or request.args.get("name") or DEFAULT_DATASET
+    if not DATASET_NAME.match(name):
+        raise ValueError(f"Invalid dataset name '{name}' (letters, digits, '.', '_' and '-')")
+    folder = req.get("folder") or request.args.get("folder")
+    if folder is None:
+        loaded = get_dataset(name)
+        if loaded is not None:
+            return loaded["source"]
+        if name != DEFAULT_DATASET:
+            raise ValueError(f"A folder is needed to load the new dataset '{name}'")
+        return data_source(name, os.path.abspath(DATA_FOLDER))
+    real = os.path.realpath(folder)
+    if os.path.commonpath([real, DATA_ROOT]) != DATA_ROOT:
+        raise ValueError(f"Folder '{folder}' is outside the data root")
+    if not os.path.isdir(real):
+        raise ValueError(f"No such folder '{folder}'")
+    return data_source(name, real)
+
+
+def _source_changed(fpath, sources):
+    info = sources.get(fpath)
+    if info is None or not os.path.exists(fpath):
+        return True
+    st = os.stat(fpath)
+    return (st.st_size, st.st_mtime) != (info["size"], info["mtime"])
+
+
+def load_default_data(source, job=None):
+    # loading excel files
+    months = discover_months(source["folder"])
+    if not months:
+        raise FileNotFoundError(f"No *_Data_Matrix*.xlsx files found in {source['folder']}")
+    inputs = [source["ingredients"], source["shipments"]]
+
+    # the merged frames only need rebuilding when any source changed
+    stem = f"merged-{_cache_prefix(source['folder'])}-{_cache_key(months + inputs)}"
+    cached = _read_cached(stem, ["group", "category", "item_rows", "ship_rows", "ship_lines"])
+    ing = read_ingredients(source["ingredients"])
+    if cached is not None:
+        group, category, item_rows, ship_rows, ship_lines = cached
+        if ship_rows.empty:
+            ship_rows = None
+        for stage in LOAD_STAGES[:-1]:
+            job_stage(job, stage, status="cached")
+    else:
+        with span("load.read_months", nbytes=sum(os.path.getsize(p) for p in months)) as counts:
+            month_frames = load_months(
+                months, lambda done, total: job_stage(job, "reading months", done, total)
+            )
+            counts["rows"] = sum(len(df) for frames in month_frames for df in frames)
+        job_stage(job, "cleaning")
+        with span("load.concat") as counts:
+            group = pd.concat([m[0] for m in month_frames], ignore_index=True)
+            category = pd.concat([m[1] for m in month_frames], ignore_index=True)
+            items = pd.concat([m[2] for m in month_frames], ignore_index=True)
+
+            # filling nas
+            group.fillna({"cost": 0}, inplace=True)
+            category.fillna({"cost": 0}, inplace=True)
+            counts["rows"] = len(group) + len(category) + len(items)
 
-        merged.reset_index(drop=True, inplace=True)
-        item_ing = merged
+        # merging items and ingredients
+        job_stage(job, "item/ingredient merge")
+        with span("load.merge_items", rows=len(items)):
+            item_rows = merge_item_rows(items, ing)
+
+        # merging shipment data
+        job_stage(job, "shipment merge")
+        with span("load.merge_shipments", nbytes=os.path.getsize(source["shipments"])) as counts:
+            # the log is streamed once; the merge only needs the lines it can match
+            ship_lines = shipment_lines(read_shipments(source["shipments"]))
+            ship_rows = match_shipment_rows(recipe_columns(ing), [ship_lines])
+            counts["rows"] = len(ship_lines)
+
+        _write_cached(stem, {
+            "group": group,
+            "category": category,
+            "item_rows": item_rows,
+            "ship_rows": ship_rows if ship_rows is not None else pd.DataFrame(),
+            "ship_lines": ship_lines,
+        })
 
-        # filling nas
+    item = assemble_item(item_rows, ing, ship_rows)
+    frames = dict(group=group, category=category, item=item,
+                  item_rows=item_rows, ing=ing, ship_rows=ship_rows, ship_lines=ship_lines)
+    ds = _publish(frames, _record_sources(months + inputs, {}), source, job)
+    return ds, months
+
+
+def load_new_months(source, job=None):
+    # builds the next version from the name's latest one, which stays untouched
+    base = get_dataset(source["name"])
+    if (base is None or base["source"] != source
+            or any(_source_changed(p, base["sources"]) for p in (source["ingredients"], source["shipments"]))):
+        return load_default_data(source, job)
+    sources = dict(base["sources"])
+    group, category, item_rows = base["group"], base["category"], base["item_rows"]
+    ing, ship_rows, ship_lines = base["ing"], base["ship_rows"], base["ship_lines"]
+
+    # new workbooks plus any whose size/mtime changed since they were loaded
+    months = discover_months(source["folder"])
+    fresh = [p for p in months if _source_changed(p, sources)]
+    removed = [p for p, info in sources.items() if info["month"] and p not in months]
+    if not fresh and not removed:
+        return base, []
+
+    with span("load.read_months", nbytes=sum(os.path.getsize(p) for p in fresh)) as counts:
+        month_frames = load_months(
+            fresh, lambda done, total: job_stage(job, "reading months", done, total)
+        )
+        counts["rows"] = sum(len(df) for frames in month_frames for df in frames)
+
+    job_stage(job, "cleaning")
+    dropped = {sources[p]["month"] for p in fresh + removed if p in sources}
+    if dropped:
+        group = group[~group["month"].isin(dropped)]
+        category = category[~category["month"].isin(dropped)]
+        item_rows = item_rows[~item_rows["month"].isin(dropped)]
+
+    new_rows = []
+    if month_frames:
+        group = pd.concat([group] + [m[0] for m in month_frames], ignore_index=True)
+        category = pd.concat([category] + [m[1] for m in month_frames], ignore_index=True)
+        items = pd.concat([m[2] for m in month_frames], ignore_index=True)
         group.fillna({"cost": 0}, inplace=True)
         category.fillna({"cost": 0}, inplace=True)
-        item_ing.fillna({"cost": 0}, inplace=True)
-        
-        item = item_ing.copy()
+        job_stage(job, "item/ingredient merge")
+        with span("load.merge_items", rows=len(items)):
+            new_rows = [merge_item_rows(items, ing)]
+    item_rows = pd.concat([item_rows] + new_rows, ignore_index=True)
+
+    # shipment rows depend only on the recipe columns, which cannot change
+    # without a full reload
+    job_stage(job, "shipment merge")
+    item = assemble_item(item_rows, ing, ship_rows)
+    frames = dict(group=group, category=category, item=item,
+                  item_rows=item_rows, ing=ing, ship_rows=ship_rows, ship_lines=ship_lines)
+
+    for fpath in removed:
+        sources.pop(fpath, None)
+    ds = _publish(frames, _record_sources(fresh, sources), source, job)
+    return ds, fresh
+
+
+# load jobs: /upload returns at once, the load runs on a background thread
+# and reports each stage; endpoints keep serving the previous version
+def new_job(mode, source):
+    job = {
+        "id": uuid.uuid4().hex[:12],
+        "mode": mode,
+        "name": source["name"],
+        "source": source,
+        "state": "queued",
+        "stage": None,
+        "stages": [{"name": name, "status": "pending"} for name in LOAD_STAGES],
+        "created_at": time.time(),
+        "finished_at": None,
+        "result": None,
+        "error": None,
+        "profile": None,
+    }
+    with jobs_changed:
+        jobs[job["id"]] = job
+        while len(jobs) > JOB_HISTORY:
+            jobs.popitem(last=False)
+    return job
+
+
+def job_stage(job, name, done=None, total=None, status="running"):
+    # enters (or updates) a stage; whatever stage was running is finished
+    if job is None:
+        return
+    now = time.time()
+    with jobs_changed:
+        for stage in job["stages"]:
+            if stage["name"] == name:
+                stage.setdefault("started_at", now)
+                stage.update(status=status, done=done, total=total)
+            elif stage["status"] == "running":
+                stage.update(status="done", seconds=round(now - stage["started_at"], 3))
+        job["state"] = "running"
+        job["stage"] = name
+        jobs_changed.notify_all()
+
+
+def job_finish(job, result=None, error=None):
+    now = time.time()
+    with jobs_changed:
+        for stage in job["stages"]:
+            if stage["status"] == "running":
+                stage.update(status="done", seconds=round(now - stage["started_at"], 3))
+        job.update(
+            state="failed" if error else "done",
+            stage=None,
+            finished_at=now,
+            result=result,
+            error=error,
+        )
+        jobs_changed.notify_all()
 
 
-        # return success
-        return jsonify({
-            "columns": list(item.columns),
-            "note": "Default data loaded and merged successfully."
-        })
+def job_snapshot(job):
+    with jobs_changed:
+        return {
+            **{k: v for k, v in job.items() if k != "stages"},
+            "stages": [
+                {k: v for k, v in stage.items() if k != "started_at"} for stage in job["stages"]
+            ],
+        }
 
+
+def run_load_job(job, profile=False):
+    profiler = start_profile() if profile else None
+    try:
+        try:
+            with load_lock, span(f"load.{job['mode']}"):
+                if job["mode"] == "incremental":
+                    ds, loaded = load_new_months(job["source"], job)
+                    note = f"Loaded {len(loaded)} new or changed month file(s)."
+                else:
+                    ds, _ = load_default_data(job["source"], job)
+                    note = f"Data for '{job['name']}' loaded and merged successfully."
+        finally:
+            if profiler is not None:
+                job["profile"] = dump_profile(profiler, "upload")
+        job_finish(job, result={
+            "dataset": ds["version"],
+            "name": ds["name"],
+            "columns": list(ds["item"].columns),
+            "months": [info["month"] for info in ds["sources"].values() if info["month"]],
+            "memory": ds["memory"],
+            "note": note
+        })
     except Exception as e:
-        return jsonify({"error": f"Failed to load default data: {str(e)}"}), 500
+        app.logger.exception("Load job %s failed", job["id"])
+        job_finish(job, error=f"Failed to load data for '{job['name']}': {str(e)}")
+
+
+@app.route("/upload", methods=["POST"])
+def upload_file():
+    # starts a load job for ?name= from ?folder= (see upload_source);
+    # ?wait=1 blocks until it finishes (scripts, tests)
+    req = request.get_json(silent=True) or {}
+    mode = req.get("mode") or request.args.get("mode", "full")
+    if mode not in LOAD_MODES:
+        return f"Invalid mode '{mode}' (choose {', '.join(LOAD_MODES)})", 400
+    wait = req.get("wait") or request.args.get("wait") in ("1", "true")
+    try:
+        source = upload_source(req)
+    except ValueError as e:
+        return str(e), 400
+
+    job = new_job(mode, source)
+    worker = threading.Thread(target=run_load_job, args=(job, profile_requested()), daemon=True)
+    worker.start()
+    if wait:
+        worker.join()
+        snapshot = job_snapshot(job)
+        if snapshot["error"]:
+            return jsonify({"job": job["id"], "error": snapshot["error"]}), 500
+        return jsonify({"job": job["id"], **snapshot["result"]})
+
+    return jsonify({
+        "job": job["id"],
+        "status_url": f"/upload/{job['id']}",
+        "events_url": f"/upload/{job['id']}/events",
+    }), 202
+
+
+@app.route("/upload/<job_id>", methods=["GET"])
+def upload_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return f"Unknown load job '{job_id}'", 404
+    return jsonify(job_snapshot(job))
+
+
+@app.route("/upload/<job_id>/events", methods=["GET"])
+def upload_events(job_id):
+    # server-sent events: one message per progress change until the job ends
+    job = jobs.get(job_id)
+    if job is None:
+        return f"Unknown load job '{job_id}'", 404
+
+    def stream():
+        last = None
+        while True:
+            # compare under the lock so no update slips in before the wait
+            with jobs_changed:
+                message = json.dumps(job_snapshot(job), default=str)
+                if message == last:
+                    jobs_changed.wait(timeout=15)
+                    message = json.dumps(job_snapshot(job), default=str)
+            if message == last:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"data: {message}\n\n"
+            last = message
+            if job["state"] in ("done", "failed"):
+                return
+
+    response = Response(stream(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@app.route("/data_status", methods=["GET"])
+def data_status():
+    ds = request_dataset()
+    sources = ds["sources"] if ds is not None else {}
+    now = time.time()
+    months = []
+    for fpath, info in sources.items():
+        if not info["month"]:
+            continue
+        months.append({
+            "month": info["month"],
+            "path": fpath,
+            "loaded_at": datetime.fromtimestamp(info["loaded_at"]).isoformat(timespec="seconds"),
+            "age_seconds": round(now - info["loaded_at"], 1),
+            "stale": _source_changed(fpath, sources),
+        })
+    folder = ds["source"]["folder"] if ds is not None else DATA_FOLDER
+    pending = [p for p in discover_months(folder) if p not in sources]
+    return jsonify({
+        "dataset": ds["version"] if ds is not None else None,
+        "folder": folder,
+        "months": months,
+        "pending": pending,
+    })
+
+
+@app.route("/datasets", methods=["GET"])
+def list_datasets():
+    with datasets_lock:
+        loaded = list(datasets.values())
+        latest = current_version
+        names = dict(latest_versions)
+    return jsonify({
+        "budget_bytes": DATASET_BUDGET,
+        "used_bytes": sum(ds["bytes"] for ds in loaded),
+        "latest": latest,
+        "names": names,
+        # least recently used first, the next to be evicted
+        "datasets": [
+            {
+                "dataset": ds["version"],
+                "name": ds["name"],
+                "folder": ds["source"]["folder"],
+                "months": [info["month"] for info in ds["sources"].values() if info["month"]],
+                "bytes": ds["bytes"],
+                "loaded_at": datetime.fromtimestamp(ds["loaded_at"]).isoformat(timespec="seconds"),
+                "models_ready": ds["models"] is not None,
+            }
+            for ds in loaded
+        ],
+    })
+
 
 
 
  
+def _cube_lookup(index, label, kind):
+    if label is None:
+        return None
+    key = canonical_name(label) if kind == "ingredient" else str(label).strip().lower()
+    position = index.get(key)
+    if position is None:
+        raise KeyError(f"Unknown {kind} '{label}'")
+    return position
+
+
+@app.route("/usage", methods=["GET"])
+def usage_slice():
+    # ?month=&ingredient= : a single value, a month row, an ingredient series,
+    # or the whole cube when neither is given
+    ds = request_dataset()
+    if ds is None:
+        return no_dataset()
+    cube = ds["usage_cube"]
+    try:
+        i = _cube_lookup(cube["month_index"], request.args.get("month"), "month")
+        j = _cube_lookup(cube["ingredient_index"], request.args.get("ingredient"), "ingredient")
+    except KeyError as e:
+        return str(e.args[0]), 400
+
+    matrix = cube["matrix"]
+    if i is not None and j is not None:
+        return jsonify({"month": cube["months"][i], "ingredient": cube["ingredients"][j],
+                        "usage": float(matrix[i, j])})
+    if i is not None:
+        return jsonify({"month": cube["months"][i], "ingredients": cube["ingredients"],
+                        "usage": matrix[i].tolist()})
+    if j is not None:
+        return jsonify({"ingredient": cube["ingredients"][j], "months": cube["months"],
+                        "usage": matrix[:, j].tolist()})
+    return jsonify({"months": cube["months"], "ingredients": cube["ingredients"],
+                    "usage": matrix.tolist()})
+
+
+@app.route("/usage/compare", methods=["GET"])
+def usage_compare():
+    # usage in ?month= against ?baseline= (default: the month before), for
+    # one ?ingredient= or all of them
+    ds = request_dataset()
+    if ds is None:
+        return no_dataset()
+    cube = ds["usage_cube"]
+    months = cube["months"]
+    if not months:
+        return "No monthly usage in the loaded data", 409
+    try:
+        i = _cube_lookup(cube["month_index"], request.args.get("month", months[-1]), "month")
+        if request.args.get("baseline"):
+            b = _cube_lookup(cube["month_index"], request.args["baseline"], "month")
+        elif i > 0:
+            b = i - 1
+        else:
+            return f"No month before {months[i]} to compare with", 400
+        j = _cube_lookup(cube["ingredient_index"], request.args.get("ingredient"), "ingredient")
+    except KeyError as e:
+        return str(e.args[0]), 400
+
+    columns = list(range(len(cube["ingredients"]))) if j is None else [j]
+    current = cube["matrix"][i, columns]
+    previous = cube["matrix"][b, columns]
+    change = current - previous
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(previous != 0, 100 * change / previous, np.nan)
+    return jsonify({
+        "month": months[i],
+        "baseline": months[b],
+        "ingredients": [cube["ingredients"][k] for k in columns],
+        "usage": current.tolist(),
+        "baseline_usage": previous.tolist(),
+        "change": change.tolist(),
+        "pct_change": [None if np.isnan(v) else float(v) for v in pct],
+    })
+
+
+@app.route("/bestsellers", methods=["GET"])
+def bestsellers():
+    # ?month= (default overall) ?k=10 ?by=Count|Amount
+    ds = request_dataset()
+    if ds is None:
+        return no_dataset()
+    ranks = ds["rankings"]
+    month = request.args.get("month", "overall")
+    by = request.args.get("by", "Count")
+    try:
+        k = max(1, int(request.args.get("k", 10)))
+    except ValueError:
+        return "k must be an integer", 400
+    if by not in ("Count", "Amount"):
+        return f"Invalid by '{by}' (choose Count, Amount)", 400
+    period = ranks["periods"].get(month.strip().lower())
+    if period is None:
+        return f"Unknown month '{month}'", 400
+
+    top = period["order"][by][:k]
+    rows = period["rows"][top]
+    indptr, indices = ranks["indptr"], ranks["indices"]
+    uses = [indices[indptr[r]:indptr[r + 1]] for r in rows]
+    ingredients = ranks["ingredients"]
+
+    # how many of the top items use each ingredient
+    shared = np.bincount(np.concatenate(uses), minlength=len(ingredients)) if uses else np.zeros(0, int)
+    shared_order = np.argsort(-shared, kind="stable")
+    return jsonify({
+        "month": month,
+        "by": by,
+        "items": [
+            {
+                "name": ranks["names"][row],
+                "count": float(period["Count"][i]),
+                "amount": float(period["Amount"][i]),
+                "ingredients": [ingredients[j] for j in used],
+            }
+            for i, row, used in zip(top, rows, uses)
+        ],
+        "shared_ingredients": [
+            {"ingredient": ingredients[j], "items": int(shared[j])}
+            for j in shared_order if shared[j] > 0
+        ],
+    })
+
+
+def _code_span(index, low, high):
+    # codes of the keys within [low, high]; None leaves that side open
+    keys = index["keys"]
+    start = 0 if low is None else int(np.searchsorted(keys, low, side="left"))
+    stop = len(keys) if high is None else int(np.searchsorted(keys, high, side="right"))
+    return start, max(start, stop)
+
+
+def query_filters(args, indexes, frame):
+    # one constraint per given filter; the spans of a constraint are OR-ed,
+    # constraints are AND-ed. ?month=May&month=June is two spans, while
+    # ?month_from=May&month_to=July is one
+    constraints = []
+    for param, column in QUERY_FILTERS.items():
+        exact = args.getlist(param)
+        low, high = args.get(f"{param}_from"), args.get(f"{param}_to")
+        if not (exact or low or high):
+            continue
+        if column not in indexes:
+            raise ValueError(f"The {frame} frame has no '{column}' column to filter on")
+        keys = {}
+        for value in exact + [v for v in (low, high) if v]:
+            keys[value] = query_key(column, value)
+            if keys[value] is None:
+                raise ValueError(f"Unknown {param} '{value}'")
+        if exact:
+            # values with the same key ("Item 1", "item 1", or one value
+            # twice) give the same span and must not select its rows twice
+            spans = {_code_span(indexes[column], keys[v], keys[v]) for v in exact}
+            constraints.append((column, tuple(sorted(spans))))
+        if low or high:
+            constraints.append((column, (_code_span(indexes[column], keys.get(low), keys.get(high)),)))
+    return tuple(constraints)
+
+
+def select_rows(df, indexes, constraints, sort):
+    # row positions matching every constraint, in result order. The most
+    # selective constraint is read straight off its index; the others only
+    # test the codes of those candidate rows
+    def size(constraint):
+        indptr = indexes[constraint[0]]["indptr"]
+        return sum(indptr[b] - indptr[a] for a, b in constraint[1])
+
+    if constraints:
+        first, *rest = sorted(constraints, key=size)
+        index = indexes[first[0]]
+        rows = np.concatenate(
+            [index["order"][index["indptr"][a]:index["indptr"][b]] for a, b in first[1]]
+        )
+        for column, spans in rest:
+            codes = indexes[column]["codes"][rows]
+            keep = np.zeros(len(rows), dtype=bool)
+            for a, b in spans:
+                keep |= (codes >= a) & (codes < b)
+            rows = rows[keep]
+        rows = np.sort(rows)
+    else:
+        rows = np.arange(len(df))
+
+    if sort:
+        column = sort.lstrip("-")
+        descending = sort.startswith("-")
+        if column in indexes:
+            # key ranks are precomputed: an integer sort, months in calendar order
+            ranks = indexes[column]["codes"][rows].astype(np.int64)
+            missing = ranks < 0
+            ranks = -ranks if descending else ranks
+            ranks[missing] = np.iinfo(np.int64).max
+            rows = rows[np.argsort(ranks, kind="stable")]
+        else:
+            values = pd.Series(plot_columns(df.iloc[rows], [column])[column].to_numpy())
+            order = values.sort_values(ascending=not descending, kind="stable", na_position="last").index
+            rows = rows[order.to_numpy()]
+    return rows
+
+
+def encode_cursor(version, offset, digest):
+    return base64.urlsafe_b64encode(json.dumps([version, offset, digest]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        version, offset, digest = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(version), int(offset), str(digest)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+
+
+@app.route("/query", methods=["GET"])
+def query_rows():
+    # rows of one frame as NDJSON, one object per line:
+    #   ?groupBy=Group|Category|Item ?columns=a,b (default all)
+    #   ?month= ?category= ?item= (repeatable) and ?month_from= ?month_to= etc.
+    #   ?sort=[-]column ?limit= (default 1000)
+    # X-Next-Cursor is set while rows remain; pass it back as ?cursor= with
+    # the same filters. A cursor stays on the dataset version it started on
+    args = request.args
+    groupBy = args.get("groupBy")
+    frame = GROUP_FRAMES.get(groupBy)
+    if frame is None:
+        return "Invalid groupBy selection", 400
+    try:
+        limit = min(max(1, int(args.get("limit", QUERY_PAGE_ROWS))), QUERY_MAX_ROWS)
+    except ValueError:
+        return "limit must be an integer", 400
+    try:
+        version, offset, digest = decode_cursor(args["cursor"]) if args.get("cursor") else (None, 0, None)
+    except ValueError as e:
+        return str(e), 400
+
+    if version:
+        ds = get_dataset(version)
+        if ds is None:
+            return f"Dataset '{version}' of this cursor was evicted; run the query again", 404
+    else:
+        ds = request_dataset()
+        if ds is None:
+            return no_dataset()
+    df = ds[frame]
+    indexes = ds["query_index"][frame]
+
+    columns = list(dict.fromkeys(c.strip() for c in args.get("columns", "").split(",") if c.strip()))
+    columns = columns or list(df.columns)
+    sort = args.get("sort", "").strip()
+    missing = [c for c in columns + [sort.lstrip("-")] if c and c not in df.columns]
+    if missing:
+        return f"Unknown columns: {missing}", 400
+    try:
+        constraints = query_filters(args, indexes, groupBy)
+    except ValueError as e:
+        return str(e), 400
+
+    key = (ds["version"], "query", frame, constraints, sort)
+    query_digest = hashlib.sha1(repr(key[1:]).encode()).hexdigest()[:12]
+    if digest is not None and digest != query_digest:
+        return "The cursor belongs to a query with different filters or sort", 400
+
+    rows = result_cache_get(key)
+    if rows is None:
+        with span("query.select") as sizes:
+            try:
+                rows = select_rows(df, indexes, constraints, sort)
+            except TypeError as e:
+                return f"Cannot sort by '{sort}': {e}", 400
+            sizes.update(rows=len(rows))
+        result_cache_put(key, rows)
+    page = rows[offset:offset + limit]
+
+    def stream():
+        for start in range(0, len(page), QUERY_PAGE_ROWS):
+            batch = plot_columns(df.iloc[page[start:start + QUERY_PAGE_ROWS]], columns)
+            values = zip(*(_column_values(batch[c]) for c in columns))
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), separators=(",", ":"), default=str) + "\n"
+                for row in values
+            )
+
+    response = Response(stream(), mimetype="application/x-ndjson")
+    response.headers["X-Total-Rows"] = str(len(rows))
+    response.headers["X-Dataset"] = ds["version"]
+    if offset + limit < len(rows):
+        response.headers["X-Next-Cursor"] = encode_cursor(ds["version"], offset + limit, query_digest)
+    return response
+
+
+# shipment vs usage reconciliation
+def _find_column(df, *keywords):
+    for col in df.columns:
+        if all(k in col.lower() for k in keywords):
+            return col
+    raise KeyError(f"Shipment data has no column matching {' '.join(keywords)!r}")
+
+
+def unit_of(name):
+    # "(g)", "(count)", "(pcs)" suffixes on recipe columns; bare unit names on shipments
+    m = re.search(r"\(([^)]*)\)\s*$", name)
+    unit = (m.group(1) if m else name).strip().lower()
+    return UNIT_FACTORS.get(unit)
+
+
+def monthly_shipments(ship):
+    # one row per shipment line with its quantity normalized to a month
+    qty = pd.to_numeric(ship[_find_column(ship, "quantity")], errors="coerce")
+    number = pd.to_numeric(ship[_find_column(ship, "number")], errors="coerce").fillna(1)
+    frequency = ship[_find_column(ship, "frequen")].astype(str).str.strip().str.lower()
+    per_month = frequency.map(SHIPMENTS_PER_MONTH).fillna(1.0)
+    return pd.DataFrame({
+        "ingredient": ship[_find_column(ship, "ingredient")].astype(str).str.strip(),
+        "unit": ship[_find_column(ship, "unit")].astype(str).str.strip(),
+        "frequency": frequency,
+        "quantity_per_shipment": qty,
+        "shipments_per_month": number * per_month,
+        "monthly_shipped": qty * number * per_month,
+    })
+
+
+def reconcile(cube, ship, basis="latest", safety=0.1, lines=False):
+    # one row per recipe ingredient: every shipment line supplying it is
+    # summed before comparing with usage. Returns (ingredients, unmatched
+    # shipment lines); lines=True adds each ingredient's line breakdown
+    shipments = monthly_shipments(ship)
+    ingredients = cube["ingredients"]
+    resolve = ingredient_resolver(ingredients)
+    recipe_units = [unit_of(c) for c in ingredients]
+
+    # shipment lines x ingredients: how many recipe units one shipment unit
+    # is worth (nan where the units can't be converted, 0 where not supplied)
+    S, K = len(shipments), len(ingredients)
+    supplies = np.zeros((S, K))
+    assumed = np.zeros((S, K), dtype=bool)
+    for s_idx, (name, unit) in enumerate(zip(shipments["ingredient"], shipments["unit"])):
+        ship_unit = unit_of(unit)
+        for part in split_ingredient(name):
+            for j in resolve(part):
+                recipe_unit = recipe_units[j]
+                if recipe_unit is None or ship_unit is None:
+                    supplies[s_idx, j] = 1.0
+                    assumed[s_idx, j] = True
+                elif recipe_unit[0] == ship_unit[0]:
+                    supplies[s_idx, j] = ship_unit[1] / recipe_unit[1]
+                else:
+                    supplies[s_idx, j] = np.nan
+    supplied = supplies != 0    # nan counts as supplied
+    matched = supplied.any(axis=1)
+
+    usage = cube["matrix"][-1] if basis == "latest" else cube["matrix"].mean(axis=0)
+    # a line supplying several ingredients ("Peas + Carrot") is split
+    # between them in proportion to their usage, evenly when none is used
+    weights = supplied * usage
+    totals = weights.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(totals > 0, weights / totals, supplied / supplied.sum(axis=1, keepdims=True))
+    share[~matched] = 0.0
+    shipped = shipments["monthly_shipped"].to_numpy(dtype=float)
+    shipped_recipe_units = np.where(supplied, shipped[:, None] * share * supplies, 0.0).sum(axis=0)
+
+    rows = []
+    for j, name in enumerate(ingredients):
+        line_idx = np.flatnonzero(supplied[:, j])
+        if len(line_idx):
+            # reported in the unit of its first shipment line
+            first = line_idx[0]
+            unit = shipments["unit"].iat[first]
+            factor = supplies[first, j]
+            per_month = float(shipments["shipments_per_month"].to_numpy(dtype=float)[line_idx].sum())
+        else:
+            unit, factor, per_month = None, 1.0, 0.0
+        rows.append({
+            "ingredient": name,
+            "unit": unit,
+            "shipment_lines": len(line_idx),
+            "supplied_by": list(dict.fromkeys(shipments["ingredient"].iloc[line_idx])),
+            "shipments_per_month": per_month,
+            "monthly_shipped": shipped_recipe_units[j] / factor,
+            "monthly_usage": usage[j] / factor,
+            "unit_assumed": bool(assumed[line_idx, j].any()),
+        })
+        if lines:
+            rows[-1]["lines"] = (
+                shipments.iloc[line_idx].assign(share=share[line_idx, j]).round(3).to_dict("records")
+            )
+    result = pd.DataFrame(rows)
+    result["surplus"] = result["monthly_shipped"] - result["monthly_usage"]
+    result["recommended_monthly_quantity"] = result["monthly_usage"] * (1 + safety)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["recommended_quantity_per_shipment"] = (
+            result["recommended_monthly_quantity"] / result["shipments_per_month"].replace(0, np.nan)
+        )
+    result["action"] = np.select(
+        [
+            result["shipment_lines"] == 0,
+            result["surplus"].isna(),
+            result["surplus"] < 0,
+            result["surplus"] > result["monthly_usage"] * safety,
+        ],
+        ["not shipped", "unit mismatch", "buy more", "buy less"],
+        "ok",
+    )
+
+    unmatched = (
+        shipments[~matched]
+        .groupby(["ingredient", "unit"], sort=False, as_index=False)[["shipments_per_month", "monthly_shipped"]]
+        .sum()
+    )
+    return result.round(3), unmatched.round(3)
+
+
+@app.route("/reconciliation", methods=["GET"])
+def reconciliation():
+    # ?basis=latest|average month of usage, ?safety= stock margin (0.1 = 10%),
+    # ?lines=1 adds the shipment lines behind each ingredient
+    basis = request.args.get("basis", "latest")
+    if basis not in ("latest", "average"):
+        return f"Invalid basis '{basis}' (choose latest, average)", 400
+    try:
+        safety = float(request.args.get("safety", 0.1))
+    except ValueError:
+        return "safety must be a number", 400
+    lines = request.args.get("lines") in ("1", "true")
+    ds = request_dataset()
+    if ds is None:
+        return no_dataset()
+    cube = ds["usage_cube"]
+    if not cube["months"]:
+        return "No monthly usage in the loaded data", 409
+
+    key = (ds["version"], "reconciliation", basis, safety, lines)
+    body = result_cache_get(key)
+    if body is None:
+        try:
+            # shipment lines of this version, read when it was loaded
+            result, unmatched = reconcile(cube, ds["ship_lines"], basis, safety, lines)
+        except Exception as e:
+            return str(e), 500
+        body = json.dumps({
+            "month": cube["months"][-1] if basis == "latest" else "average",
+            "rows": result.astype(object).where(result.notna(), None).to_dict("records"),
+            "unmatched": unmatched.to_dict("records"),
+        }, default=str).encode()
+        result_cache_put(key, body)
+    return Response(body, mimetype="application/json")
+
+
 @app.route("/get_dataframe_columns", methods=["POST"])
 def get_dataframe_columns():
-    global group, category, item
     req = request.json or {}
     groupBy = req.get("groupBy")
 
-    df_map = {
-        "Group": group,
-        "Category": category,
-        "Item": item
-    }
-
-    df = df_map.get(groupBy)
+    ds = request_dataset()
+    df = ds.get(GROUP_FRAMES.get(groupBy)) if ds is not None else None
     if df is None:
         return jsonify({"columns": []})
 
@@ -591,76 +2026,687 @@ def get_dataframe_columns():
 
 
 
-@app.route("/plot", methods=["POST"])
+# rendered plot cache (LRU of PNG bytes and their response headers); keys
+# start with the dataset version so entries of evicted datasets can be dropped
+def plot_cache_get(key):
+    with plot_cache_lock:
+        entry = plot_cache.get(key)
+        if entry is not None:
+            plot_cache.move_to_end(key)
+        return entry
+
+
+def plot_cache_put(key, entry):
+    with plot_cache_lock:
+        plot_cache[key] = entry
+        plot_cache.move_to_end(key)
+        while len(plot_cache) > PLOT_CACHE_SIZE:
+            plot_cache.popitem(last=False)
+
+
+def plot_cache_clear():
+    with plot_cache_lock:
+        plot_cache.clear()
+
+
+def plot_cache_drop(versions):
+    with plot_cache_lock:
+        for key in [k for k in plot_cache if k[0] in versions]:
+            del plot_cache[key]
+
+
+def result_cache_get(key):
+    with result_cache_lock:
+        entry = result_cache.get(key)
+        if entry is None:
+            return None
+        result_cache.move_to_end(key)
+        return entry[0]
+
+
+def result_cache_put(key, value):
+    # a result bigger than the whole budget is recomputed every time
+    nbytes = held_bytes(value)
+    if nbytes > RESULT_CACHE_BYTES:
+        return
+    with result_cache_lock:
+        old = result_cache.pop(key, None)
+        if old is not None:
+            result_cache_held["bytes"] -= old[1]
+        result_cache[key] = (value, nbytes)
+        result_cache_held["bytes"] += nbytes
+        while result_cache_held["bytes"] > RESULT_CACHE_BYTES:
+            _, (_, dropped) = result_cache.popitem(last=False)
+            result_cache_held["bytes"] -= dropped
+
+
+def result_cache_clear():
+    with result_cache_lock:
+        result_cache.clear()
+        result_cache_held["bytes"] = 0
+
+
+def result_cache_drop(versions):
+    with result_cache_lock:
+        for key in [k for k in result_cache if k[0] in versions]:
+            result_cache_held["bytes"] -= result_cache.pop(key)[1]
+
+
+def png_response(png, info, etag):
+    response = Response(png, mimetype="image/png")
+    response.headers.update({k: str(v) for k, v in info.items()})
+    response.set_etag(etag)
+    # browsers keep the image but revalidate it, getting a 304 while unchanged
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.route("/plot", methods=["GET", "POST"])
 def plot():
-    global group, category, item
-    req = request.json or {}
+    req = request.args if request.method == "GET" else (request.json or {})
     x = req.get("x")
     y = req.get("y")
     groupBy = req.get("groupBy")
     plot_type = req.get("plotType", "scatterplot").lower()
-
-    df_map = {
-        "Group": group,
-        "Category": category,
-        "Item": item
-    }
-
-    df_temp = df_map.get(groupBy)
+    # "ci": analytic interval, "none": means only, "bootstrap": seaborn's own
+    errorbar = req.get("errorbar", "ci")
+    scatter_mode = req.get("scatterMode", "auto")
+
+    ds = request_dataset()
+    if ds is None:
+        return no_dataset()
+    df_temp = ds.get(GROUP_FRAMES.get(groupBy))
     if df_temp is None:
         return "Invalid groupBy selection", 400
 
     if plot_type == "pie chart" and x and y:
         return "Pie chart can only have one variable (choose either X or Y).", 400
 
-    plt.figure(figsize=(8, 6))
+    error = plot_error(plot_type, x, y)
+    if error:
+        return error, 400
+    if errorbar not in ERRORBARS:
+        return f"Invalid errorbar '{errorbar}' (choose {', '.join(ERRORBARS)})", 400
+    if scatter_mode not in SCATTER_MODES:
+        return f"Invalid scatterMode '{scatter_mode}' (choose {', '.join(SCATTER_MODES)})", 400
     try:
-        if plot_type == "scatterplot":
-            if x and y:
-                sns.scatterplot(data=df_temp, x=x, y=y).tick_params(axis='x', labelrotation=90)
-                plt.title(f"Scatterplot: {y} vs {x} ({groupBy})")
-            else:
-                return "Scatterplot requires both X and Y variables.", 400
+        max_points = int(req.get("maxPoints", SCATTER_POINT_BUDGET))
+    except (TypeError, ValueError):
+        return "maxPoints must be an integer", 400
+    if max_points < 1:
+        return "maxPoints must be at least 1", 400
+
+    key = (ds["version"], "plot", groupBy, x, y, plot_type, errorbar, scatter_mode, max_points)
+    etag = hashlib.sha1(repr(key).encode()).hexdigest()
+    if request.if_none_match.contains(etag):
+        return png_response(b"", {}, etag).make_conditional(request)
+    cached = plot_cache_get(key)
+    if cached is not None:
+        return png_response(*cached, etag)
 
-        elif plot_type == "barplot":
-            if x and y:
-                sns.barplot(data=df_temp, x=x, y=y).tick_params(axis='x', labelrotation=90)
-                plt.title(f"Barplot of {y} by {x} ({groupBy})")
+    try:
+        with span("plot.total") as counts:
+            # only the plotted columns travel to the renderer
+            df_plot = plot_columns(df_temp, (x, y))
+            counts["rows"] = len(df_plot)
+            args = (df_plot, groupBy, x, y, plot_type, errorbar, scatter_mode, max_points)
+            if g.get("profiler") is not None:
+                png, info, timings = render_plot(*args)   # on this thread, so it is profiled
             else:
-                return "Barplot requires both X and Y variables.", 400
+                png, info, timings = render_pool.submit(render_plot, *args).result()
+            counts["bytes"] = len(png)
+        record_span("plot.compute", timings["compute"], len(df_plot))
+        record_span("plot.encode", timings["encode"], nbytes=len(png))
+        plot_cache_put(key, (png, info))
+        return png_response(png, info, etag)
 
-        elif plot_type == "line plot":
-            if x and y:
-                sns.lineplot(data=df_temp, x=x, y=y).tick_params(axis='x', labelrotation=90)
-                plt.title(f"Line Plot of {y} vs {x} ({groupBy})")
-            else:
-                return "Line plot requires both X and Y variables.", 400
+    except Exception as e:
+        return str(e), 500
 
-        elif plot_type == "pie chart":
-            var = x or y
-            if not var:
-                return "Pie chart requires one variable.", 400
-            counts = df_temp[var].value_counts()
-            plt.pie(counts.values, labels=counts.index, autopct='%1.1f%%')
-            plt.title(f"Pie Chart of {var} ({groupBy})")
 
+def plot_error(plot_type, x, y):
+    required = {
+        "scatterplot": "Scatterplot",
+        "barplot": "Barplot",
+        "line plot": "Line plot",
+    }
+    if plot_type in required:
+        if not (x and y):
+            return f"{required[plot_type]} requires both X and Y variables."
+    elif plot_type == "pie chart":
+        if not (x or y):
+            return "Pie chart requires one variable."
+    else:
+        return f"Invalid plot type '{plot_type}'"
+    return None
+
+
+def can_aggregate(df, x, y):
+    return x != y and pd.api.types.is_numeric_dtype(df[y])
+
+
+def aggregate_xy(df, x, y, errorbar="ci"):
+    # mean of y per x level plus a normal-approximation 95% interval, with
+    # levels in the order seaborn would draw them (sorted only when numeric).
+    # Replaces seaborn's per-request bootstrap over the full frame.
+    stats = df.groupby(x, sort=False)[y].agg(["mean", "std", "count"])
+    stats = stats[stats["count"] > 0]
+    if pd.api.types.is_numeric_dtype(df[x]):
+        stats = stats.sort_index()
+
+    if errorbar == "ci":
+        half = 1.96 * stats["std"] / np.sqrt(stats["count"])
+    else:
+        half = np.nan
+    stats["low"] = stats["mean"] - half
+    stats["high"] = stats["mean"] + half
+    return stats.drop(columns="std").reset_index()
+
+
+def sample_points(df, x, budget, seed=0):
+    # reproducible sample of about budget rows; when x is categorical each
+    # level is sampled at its own rate so small levels still show up
+    n = len(df)
+    if n <= budget:
+        return df
+    rng = np.random.default_rng(seed)
+    if pd.api.types.is_numeric_dtype(df[x]):
+        return df.iloc[np.sort(rng.choice(n, budget, replace=False))]
+
+    codes, _ = pd.factorize(df[x])
+    sizes = np.bincount(codes)
+    rate = np.maximum(budget * sizes / n, 1) / sizes
+    return df.iloc[np.flatnonzero(rng.random(n) < rate[codes])]
+
+
+def render_plot(df_temp, groupBy, x, y, plot_type, errorbar="ci",
+                scatter_mode="auto", max_points=SCATTER_POINT_BUDGET):
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    # explicit Figure/Axes instead of pyplot, so concurrent renders never
+    # share or close each other's figures
+    start = time.perf_counter()
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    info = {}
+
+    if plot_type == "scatterplot":
+        points = df_temp.dropna(subset=[x, y])
+        total = len(points)
+        numeric = all(pd.api.types.is_numeric_dtype(points[c]) for c in (x, y))
+        if scatter_mode == "auto":
+            scatter_mode = "full" if total <= max_points else "sample"
+        if scatter_mode == "hexbin" and not numeric:
+            scatter_mode = "sample"
+
+        if scatter_mode == "hexbin":
+            bins = ax.hexbin(points[x], points[y], gridsize=50, mincnt=1, cmap="Blues")
+            fig.colorbar(bins, ax=ax, label="points")
+            ax.set_xlabel(x)
+            ax.set_ylabel(y)
+            drawn = len(bins.get_offsets())
+            subtitle = f"{total:,} points in {drawn:,} bins"
+        else:
+            if scatter_mode == "sample":
+                points = sample_points(points, x, max_points)
+            drawn = len(points)
+            sns.scatterplot(data=points, x=x, y=y, ax=ax)
+            subtitle = f"{drawn:,} of {total:,} points"
+        ax.tick_params(axis='x', labelrotation=90)
+        ax.set_title(f"Scatterplot: {y} vs {x} ({groupBy}, {subtitle})")
+        info = {"X-Scatter-Mode": scatter_mode, "X-Points-Drawn": drawn, "X-Points-Total": total}
+
+    elif plot_type == "barplot":
+        if errorbar != "bootstrap" and can_aggregate(df_temp, x, y):
+            agg = aggregate_xy(df_temp, x, y, errorbar)
+            sns.barplot(data=agg, x=x, y="mean", order=list(agg[x]), errorbar=None, ax=ax)
+            if errorbar == "ci":
+                ax.errorbar(
+                    range(len(agg)), agg["mean"],
+                    yerr=[agg["mean"] - agg["low"], agg["high"] - agg["mean"]],
+                    fmt="none", ecolor=".26", linewidth=2.25,
+                )
+            ax.set_ylabel(y)
+        else:
+            sns.barplot(data=df_temp, x=x, y=y, ax=ax)
+        ax.tick_params(axis='x', labelrotation=90)
+        ax.set_title(f"Barplot of {y} by {x} ({groupBy})")
+
+    elif plot_type == "line plot":
+        if errorbar != "bootstrap" and can_aggregate(df_temp, x, y):
+            agg = aggregate_xy(df_temp, x, y, errorbar)
+            sns.lineplot(data=agg, x=x, y="mean", errorbar=None, ax=ax)
+            if errorbar == "ci":
+                ax.fill_between(agg[x], agg["low"], agg["high"], alpha=0.2, linewidth=0)
+            ax.set_ylabel(y)
         else:
-            return f"Invalid plot type '{plot_type}'", 400
+            sns.lineplot(data=df_temp, x=x, y=y, ax=ax)
+        ax.tick_params(axis='x', labelrotation=90)
+        ax.set_title(f"Line Plot of {y} vs {x} ({groupBy})")
+
+    elif plot_type == "pie chart":
+        var = x or y
+        counts = df_temp[var].value_counts()
+        ax.pie(counts.values, labels=counts.index, autopct='%1.1f%%')
+        ax.set_title(f"Pie Chart of {var} ({groupBy})")
+
+    fig.tight_layout()
+    drawn = time.perf_counter()
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    # timed here because renders may run in worker processes
+    timings = {"compute": drawn - start, "encode": time.perf_counter() - drawn}
+    return buf.getvalue(), info, timings
+
+
+
+
+
+@app.route("/plot_data", methods=["GET", "POST"])
+def plot_data():
+    # column-wise series for charting in the browser: per-x means with their
+    # interval (bar/line) and value counts of a single variable (pie)
+    req = request.args if request.method == "GET" else (request.json or {})
+    x = req.get("x")
+    y = req.get("y")
+    groupBy = req.get("groupBy")
+    fmt = req.get("format", "json")
 
-        plt.tight_layout()
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
-        plt.close('all')
-        return send_file(buf, mimetype="image/png")
+    ds = request_dataset()
+    if ds is None:
+        return no_dataset()
+    df_temp = ds.get(GROUP_FRAMES.get(groupBy))
+    if df_temp is None:
+        return "Invalid groupBy selection", 400
+    missing = [c for c in (x, y) if c and c not in df_temp.columns]
+    if missing or not (x or y):
+        return f"Unknown or missing columns: {missing}", 400
+    if fmt not in ("json", "arrow"):
+        return f"Invalid format '{fmt}'", 400
+
+    key = (ds["version"], "data", groupBy, x, y, fmt)
+    etag = hashlib.sha1(repr(key).encode()).hexdigest()
+    if request.if_none_match.contains(etag):
+        return data_response(b"", fmt, etag).make_conditional(request)
+
+    body = plot_cache_get(key)
+    if body is None:
+        try:
+            with span("plot_data.encode") as sizes:
+                df_temp = plot_columns(df_temp, (x, y))
+                series = None
+                if x and y and can_aggregate(df_temp, x, y):
+                    series = aggregate_xy(df_temp, x, y)
+                var = x or y
+                counts = df_temp[var].value_counts()
+                counts = pd.DataFrame({"labels": counts.index, "values": counts.to_numpy()})
+                body = encode_series(series, counts, fmt, x, y, ds["version"])
+                sizes.update(rows=len(df_temp), bytes=len(body))
+        except Exception as e:
+            return str(e), 500
+        plot_cache_put(key, body)
+    return data_response(body, fmt, etag)
+
+
+def _column_values(col):
+    values = col.to_numpy(dtype=object)
+    return [None if pd.isna(v) else v.item() if hasattr(v, "item") else v for v in values]
+
+
+def encode_series(series, counts, fmt, x, y, version):
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        # one IPC stream holding the series table (or the counts for pie-only requests)
+        table = pa.Table.from_pandas(series if series is not None else counts, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    payload = {
+        "version": version,
+        "x": x,
+        "y": y,
+        "series": None if series is None else {
+            "x": _column_values(series[x]),
+            "mean": _column_values(series["mean"]),
+            "low": _column_values(series["low"]),
+            "high": _column_values(series["high"]),
+            "count": _column_values(series["count"]),
+        },
+        "counts": {
+            "labels": _column_values(counts["labels"]),
+            "values": _column_values(counts["values"]),
+        },
+    }
+    return json.dumps(payload, separators=(",", ":"), default=str).encode()
+
+
+def data_response(body, fmt, etag):
+    mimetype = "application/vnd.apache.arrow.stream" if fmt == "arrow" else "application/json"
+    response = Response(body, mimetype=mimetype)
+    if len(body) > 1024 and "gzip" in request.headers.get("Accept-Encoding", ""):
+        response.set_data(gzip.compress(body, compresslevel=5))
+        response.headers["Content-Encoding"] = "gzip"
+        response.headers["Vary"] = "Accept-Encoding"
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
+
+
+
+
+# forecasting models (fit once per data version, in the background)
+def month_start(month):
+    try:
+        return date(DATA_YEAR, datetime.strptime(str(month), "%B").month, 1)
+    except ValueError:
+        return None
+
+
+def monthly_targets(group_df):
+    # one column per forecast target, one row per month
+    df = plot_columns(group_df, ["month", "Group", "Amount", "Count"])
+    df["date"] = df["month"].map(month_start)
+    df = df.dropna(subset=["date"])
+
+    targets = pd.DataFrame({
+        "Revenue": df.groupby("date")["Amount"].sum(),
+        "Items Sold": df.groupby("date")["Count"].sum(),
+    })
+    by_group = df.pivot_table(index="date", columns="Group", values="Amount", aggfunc="sum")
+    for name in by_group.columns:
+        targets[f"Revenue - {name}"] = by_group[name]
+    return targets.sort_index()
+
+
+def fit_target(series, split_date):
+    import statsmodels.api as sm
+    from sklearn.preprocessing import StandardScaler
+
+    # linear trend on the month index, standardized on the training months
+    t = np.arange(len(series), dtype=float).reshape(-1, 1)
+    train = np.asarray(series.index < split_date) & series.notna().to_numpy()
+    if train.sum() < 2:
+        raise ValueError(f"{int(train.sum())} training month(s), a trend needs at least 2")
+    scaler = StandardScaler().fit(t[train])
+    X = sm.add_constant(scaler.transform(t), has_constant="add")
+    model = sm.OLS(series.to_numpy()[train], X[train]).fit()
+
+    ahead = sm.add_constant(scaler.transform([[len(series)]]), has_constant="add")
+    next_date = (pd.Timestamp(series.index[-1]) + pd.DateOffset(months=1)).date()
+    predicted = np.append(model.predict(X), model.predict(ahead))
+    frame = pd.DataFrame({
+        "date": list(series.index) + [next_date],
+        "actual": np.append(series.to_numpy(dtype=float), np.nan),
+        "predicted": predicted,
+        "split": np.where(train, "train", "test").tolist() + ["forecast"],
+    })
+    params = {
+        "const": float(model.params[0]),
+        "slope": float(model.params[1]),
+        "scaler_mean": float(scaler.mean_[0]),
+        "scaler_scale": float(scaler.scale_[0]),
+        "r2": float(model.rsquared) if train.sum() > 2 else None,
+    }
+    return frame, params
+
+
+def batch_forecast(Y, dates, split_date, method="linear", alpha=0.5):
+    # fits every column of Y (months x series) at once: one least-squares
+    # solve for linear trends, or exponential smoothing stepped over months
+    Y = np.asarray(Y, dtype=float)
+    T = Y.shape[0]
+    train = np.asarray([d < split_date for d in dates])
+
+    if method == "linear":
+        X = np.column_stack([np.ones(T + 1), np.arange(T + 1, dtype=float)])
+        beta, *_ = np.linalg.lstsq(X[:T][train], Y[train], rcond=None)
+        predicted = X @ beta
+    elif method == "ses":
+        predicted = np.empty((T + 1, Y.shape[1]))
+        level = Y[0].copy()
+        predicted[0] = level
+        for t in range(T):
+            if train[t]:
+                level = alpha * Y[t] + (1 - alpha) * level
+            predicted[t + 1] = level
+    else:
+        raise ValueError(f"Unknown forecast method '{method}'")
+    return predicted
+
+
+def tidy_forecast(Y, predicted, dates, columns, train, method):
+    T, K = Y.shape
+    next_date = (pd.Timestamp(dates[-1]) + pd.DateOffset(months=1)).date()
+    split = np.append(np.where(train, "train", "test"), "forecast")
+    return pd.DataFrame({
+        "date": np.repeat(np.array(list(dates) + [next_date], dtype=object), K),
+        "ingredient": np.tile(np.asarray(columns, dtype=object), T + 1),
+        "actual": np.vstack([Y, np.full((1, K), np.nan)]).ravel(),
+        "predicted": predicted.ravel(),
+        "split": np.repeat(split, K),
+        "method": method,
+    })
+
+
+def forecast_usage(usage, split_date):
+    dates = list(usage.index)
+    Y = usage.to_numpy(dtype=float)
+    train = np.asarray([d < split_date for d in dates])
+    frames = [
+        tidy_forecast(Y, batch_forecast(Y, dates, split_date, method), dates, usage.columns, train, method)
+        for method in ("linear", "ses")
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_models(ds):
+    start = time.perf_counter()
+    version, group_df, cube = ds["version"], ds["group"], ds["usage_cube"]
+    stem = f"models-{version}"
+    preds_path = os.path.join(CACHE_FOLDER, f"{stem}-predictions.parquet")
+    params_path = os.path.join(CACHE_FOLDER, f"{stem}-params.json")
+    usage_path = os.path.join(CACHE_FOLDER, f"{stem}-usage.parquet")
+    try:
+        targets = monthly_targets(group_df)
+        # the last month is held out for testing when there is enough history
+        split = targets.index[-1] if len(targets) >= 3 else targets.index[-1] + pd.DateOffset(days=1)
+        split = pd.Timestamp(split).date()
+
+        if all(os.path.exists(p) for p in (preds_path, params_path, usage_path)):
+            preds = pd.read_parquet(preds_path)
+            preds["date"] = pd.to_datetime(preds["date"]).dt.date
+            with open(params_path) as f:
+                fitted = json.load(f)
+            params, skipped = fitted["params"], fitted["skipped"]
+            usage_preds = pd.read_parquet(usage_path)
+            usage_preds["date"] = pd.to_datetime(usage_preds["date"]).dt.date
+        else:
+            # a target without enough history (a group that only appears in
+            # the newest month) is skipped; the others still get their fit
+            frames, params, skipped = [], {}, {}
+            for name in targets.columns:
+                try:
+                    frame, params[name] = fit_target(targets[name], split)
+                except Exception as e:
+                    app.logger.warning("Skipped forecast target %s: %s", name, e)
+                    skipped[name] = str(e)
+                    continue
+                frame.insert(0, "target", name)
+                frames.append(frame)
+            if not frames:
+                raise ValueError(f"no forecast target could be fitted: {skipped}")
+            preds = pd.concat(frames, ignore_index=True)
+            usage_preds = forecast_usage(usage_frame(cube), split)
+            try:
+                # one fitted version per dataset name stays on disk
+                _prune_cached(f"models-{ds['name']}@", stem)
+                preds.to_parquet(preds_path)
+                usage_preds.to_parquet(usage_path)
+                with open(params_path, "w") as f:
+                    json.dump({"params": params, "skipped": skipped}, f)
+            except Exception as e:
+                app.logger.warning("Could not cache models %s: %s", stem, e)
+
+        record_span("models.fit", time.perf_counter() - start, rows=len(targets))
+        with model_lock:
+            ds["models"] = {
+                "train": targets[targets.index < split],
+                "test": targets[targets.index >= split],
+                "split_before_date": split,
+                "split_after_date": targets.index[-1],
+                "params": params,
+                "skipped": skipped,
+                "predictions": preds,
+                "usage_forecast": usage_preds,
+            }
+        charge_dataset(ds, held_bytes(ds["models"]))
+        app.logger.info("Fitted %d forecast targets for data version %s", len(params), version)
     except Exception as e:
-        plt.close('all')
-        return str(e), 500
+        app.logger.exception("Model build failed: %s", e)
+        # reported by the model endpoints instead of "not ready yet"
+        with model_lock:
+            ds["models_error"] = str(e)
+
+
+def start_model_build(ds):
+    if ds["models"] is not None:
+        return
+    threading.Thread(target=build_models, args=(ds,), daemon=True).start()
+
+
+def ready_models(ds):
+    with model_lock:
+        return ds["models"]
+
+
+def models_unavailable(ds):
+    # response for the model endpoints while ds has no models
+    with model_lock:
+        error = ds["models_error"]
+    if error:
+        return f"Model fit failed: {error}", 500
+    return "Model is not ready yet, try again shortly.", 409
+
+
+@app.route("/model_status", methods=["GET"])
+def model_status():
+    ds = request_dataset()
+    if ds is None:
+        return no_dataset()
+    models = ready_models(ds)
+    return jsonify({
+        "ready": models is not None,
+        "version": ds["version"],
+        "error": ds["models_error"],
+        "targets": sorted(models["params"]) if models else [],
+        "skipped": models["skipped"] if models else {},
+        "split_before_date": models["split_before_date"].isoformat() if models else None,
+    })
+
+
+@app.route("/usage_forecast", methods=["GET"])
+def usage_forecast_rows():
+    ingredient = request.args.get("ingredient")
+    method = request.args.get("method", "linear")
+    ds = request_dataset()
+    if ds is None:
+        return no_dataset()
+    models = ready_models(ds)
+    if models is None:
+        return models_unavailable(ds)
+
+    preds = models["usage_forecast"]
+    rows = preds[preds["method"] == method]
+    if ingredient:
+        rows = rows[rows["ingredient"] == ingredient]
+    if rows.empty:
+        return f"No usage forecast for ingredient '{ingredient}' with method '{method}'", 400
+    rows = rows.assign(date=rows["date"].map(lambda d: d.isoformat()))
+    return jsonify(rows.replace({np.nan: None}).to_dict("records"))
+
+
+@app.route("/plot_results", methods=["POST"])
+def plot_results():
+    req = request.json or {}
+    target = req.get("target")
+    try:
+        until = date.fromisoformat(req.get("date", ""))
+    except ValueError:
+        return "Invalid date, expected YYYY-MM-DD", 400
+
+    ds = request_dataset()
+    if ds is None:
+        return no_dataset()
+    models = ready_models(ds)
+    if models is None:
+        return models_unavailable(ds)
+
+    if target in models["skipped"]:
+        return f"No model for '{target}': {models['skipped'][target]}", 400
+    preds = models["predictions"]
+    rows = preds[(preds["target"] == target) & (preds["date"] <= until)]
+    if rows.empty:
+        return f"No predictions for '{target}' on or before {until}", 400
+
+    # every date inside the same month returns the same result
+    key = (ds["version"], "results", target, rows["date"].max())
+    cached = result_cache_get(key)
+    if cached is None:
+        cached = jsonify(results_payload(rows, target, models["split_before_date"])).get_data()
+        result_cache_put(key, cached)
+    return Response(cached, mimetype="application/json")
+
+
+def results_payload(rows, target, split_before_date=None):
+    from matplotlib.figure import Figure
+    from sklearn.metrics import mean_squared_error, explained_variance_score
+
+    scored = rows.dropna(subset=["actual"])
+    tested = scored[scored["split"] == "test"]
+    if tested.empty:
+        tested = scored
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.plot(rows["date"], rows["actual"], marker="o", label="Actual")
+    ax.plot(rows["date"], rows["predicted"], marker="o", linestyle="--", label="Predicted")
+    if split_before_date is not None and rows["date"].min() < split_before_date <= rows["date"].max():
+        ax.axvline(split_before_date, color=".5", linewidth=1)
+    ax.set_title(f"Actual vs Predicted: {target}")
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.legend()
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+
+    def metric(fn):
+        if len(tested) == 0:
+            return None
+        return float(fn(tested["actual"], tested["predicted"]))
+
+    return {
+        "image": base64.b64encode(buf.getvalue()).decode(),
+        "mse": metric(mean_squared_error),
+        "variance": float(np.var(scored["actual"])) if len(scored) else None,
+        "explained_variance": metric(explained_variance_score) if len(tested) > 1 else None,
+        "rows": [
+            {**r, "date": r["date"].isoformat()}
+            for r in rows.replace({np.nan: None}).to_dict("records")
+        ],
+    }
+
+
 
 
 
+if PREWARM:
+    threading.Thread(target=prewarm, daemon=True).start()
 
 
 if __name__ == "__main__":
-    app.run(debug=True, port = 5001)
\ No newline at end of file
+    app.run(debug=True, port = 5001, threaded=True)
\ No newline at end of file
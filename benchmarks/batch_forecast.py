@@ -0,0 +1,70 @@
+# batch_forecast.py
+# Batched per-ingredient trend fits versus one statsmodels OLS per ingredient.
+#
+#   python benchmarks/batch_forecast.py --ingredients 20 --scales 10 100 1000
+#
+# Fits the month x ingredient usage of `scale` synthetic locations side by
+# side (synthetic_data.py's usage_matrix), so no data/ folder is needed.
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import statsmodels.api as sm
+
+from synthetic_data import usage_matrix
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import app as msy  # noqa: E402
+
+
+def statsmodels_loop(Y, train):
+    T = Y.shape[0]
+    X = sm.add_constant(np.arange(T + 1, dtype=float))
+    predicted = np.empty((T + 1, Y.shape[1]))
+    for k in range(Y.shape[1]):
+        model = sm.OLS(Y[train, k], X[:T][train]).fit()
+        predicted[:, k] = model.predict(X)
+    return predicted
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--ingredients", type=int, default=20)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    dates = [date(2025 + (m // 12), m % 12 + 1, 1) for m in range(args.months)]
+    split = dates[-1]
+    train = np.asarray([d < split for d in dates])
+
+    print(f"{'series':>8} {'loop s':>9} {'batch s':>9} {'speedup':>8}")
+    for scale in args.scales:
+        Y = np.hstack([
+            usage_matrix(np.random.default_rng(location), args.months, args.items, args.ingredients)
+            for location in range(scale)
+        ]).astype(float)
+        K = Y.shape[1]
+
+        loop_s, expected = timed(lambda: statsmodels_loop(Y, train), args.repeat)
+        batch_s, got = timed(lambda: msy.batch_forecast(Y, dates, split, "linear"), args.repeat)
+        assert np.allclose(expected, got), "batched fit disagrees with statsmodels"
+        print(f"{K:>8} {loop_s:>9.4f} {batch_s:>9.4f} {loop_s / batch_s:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# numeric_cleanup.py
+# Amount/Count cleanup: the per-cell regex versus the dtype-aware fast path.
+#
+#   python benchmarks/numeric_cleanup.py --rows 1000000 4000000
+#
+# Builds an Item sheet in memory with synthetic_data.py, so no data/ folder
+# is needed. Each column layout is one the month workbooks produce: currency
+# text, numbers the reader already typed, and text with the odd stray value.
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import currency, month_sheets
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import app as msy  # noqa: E402
+
+
+def synthetic_columns(rows, seed=0):
+    # one month's Item sheet with `rows` items
+    rng = np.random.default_rng(seed)
+    _, sheets = month_sheets(rng, 1, rows)
+    item = sheets[0][1]["Item"]
+    amount, count = item["Amount"].round(2), item["Count"]
+    text = pd.Series(currency(amount), dtype=object)
+    stray = text.copy()
+    stray[rng.random(rows) < 0.01] = "N/A"
+    stray[rng.random(rows) < 0.01] = np.nan
+    return {
+        "currency text": (text, count.astype(str).astype(object)),
+        "typed numbers": (amount, count),
+        "text with strays": (stray, count.astype(str).astype(object)),
+    }
+
+
+def regex_clean(amount, count):
+    # the previous clean_frame: regex every cell, then divide
+    amount, count = msy._strip_numeric(amount), msy._strip_numeric(count)
+    return amount, count, (amount / count).fillna(0)
+
+
+def fast_clean(amount, count):
+    amount, count = msy.to_number(amount), msy.to_number(count)
+    return amount, count, msy.unit_cost(amount, count)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 3_000_000])
+    args = parser.parse_args()
+
+    print(f"pyarrow string kernels: {'yes' if msy.ARROW_STRINGS else 'no'}")
+    print(f"{'rows':>9}  {'columns':<18} {'regex s':>8} {'fast s':>8} {'speedup':>8}")
+    for rows in args.rows:
+        for layout, (amount, count) in synthetic_columns(rows).items():
+            regex_s, expected = timed(regex_clean, amount, count)
+            fast_s, got = timed(fast_clean, amount, count)
+            for old, new in zip(expected[:2], got[:2]):
+                pd.testing.assert_series_equal(old, new, check_names=False)
+            # cost differs only where Count is 0: inf before, 0 now
+            old_cost = expected[2].replace([np.inf, -np.inf], 0).to_numpy()
+            assert np.array_equal(old_cost, got[2]), "cost differs"
+            print(f"{rows:>9}  {layout:<18} {regex_s:>8.2f} {fast_s:>8.2f} {regex_s / fast_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
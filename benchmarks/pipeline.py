@@ -0,0 +1,231 @@
+# pipeline.py
+# End-to-end timings through the Flask test client: every load stage of
+# POST /upload (cold and from the parquet cache) and every /plot type, as
+# latency percentiles plus peak memory, written to a JSON report.
+#
+#   python benchmarks/pipeline.py --items 2000 --shipment-rows 500000 --out before.json
+#   python benchmarks/pipeline.py --items 2000 --shipment-rows 500000 --out after.json --compare before.json
+#   python benchmarks/pipeline.py --data data --repeat 10
+#
+# Without --data a synthetic folder is written with synthetic_data.py, so the
+# same arguments measure the same input on every commit. Latencies come from
+# untraced runs; peak_mib is the Python heap peak (tracemalloc) of one more
+# run, which leaves out workbooks read in ingest worker processes (with
+# MSY_INGEST_WORKERS > 1). max_rss_mib is the harness process's peak RSS.
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import write_dataset
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import app as msy  # noqa: E402
+
+
+PLOTS = [
+    ("barplot", {"groupBy": "Item", "x": "month", "y": "Count"}),
+    ("line plot", {"groupBy": "Group", "x": "month", "y": "Amount"}),
+    ("scatterplot", {"groupBy": "Item", "x": "Count", "y": "Amount"}),
+    ("pie chart", {"groupBy": "Category", "x": "Category"}),
+]
+MODEL_TIMEOUT = 600
+
+
+def use_folders(data, cache):
+    # the app reads these at import time; point them at the benchmark folders
+    msy.DATA_FOLDER = data
+    msy.CACHE_FOLDER = cache
+
+
+def reset(cache, cold):
+    # forget loaded versions (and their fitted models) so every load does the
+    # full work; a cold load also starts without the parquet cache
+    with msy.datasets_lock:
+        msy.datasets.clear()
+    msy.plot_cache_clear()
+    msy.result_cache_clear()
+    if cold:
+        shutil.rmtree(cache, ignore_errors=True)
+        os.makedirs(cache)
+
+
+def stage_totals():
+    with msy.metrics_lock:
+        return {stage: (s["count"], s["sum"]) for stage, s in msy.stage_stats.items()}
+
+
+def load(client):
+    # seconds for POST /upload and seconds per stage, including the
+    # background model fit the load starts
+    before = stage_totals()
+    start = time.perf_counter()
+    response = client.post("/upload?wait=1")
+    seconds = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"/upload failed: {response.get_data(as_text=True)}")
+    ds = msy.get_dataset(response.get_json()["dataset"])
+    deadline = time.time() + MODEL_TIMEOUT
+    while msy.ready_models(ds) is None and time.time() < deadline:
+        time.sleep(0.05)
+    stages = {}
+    for stage, (count, total) in stage_totals().items():
+        count_before, total_before = before.get(stage, (0, 0.0))
+        if count > count_before:
+            stages[stage] = total - total_before
+    return seconds, stages
+
+
+def render(client, query):
+    msy.plot_cache_clear()
+    start = time.perf_counter()
+    response = client.get("/plot", query_string=query)
+    seconds = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"/plot {query} failed: {response.get_data(as_text=True)}")
+    return seconds
+
+
+def traced_peak(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def summary(samples):
+    samples = np.asarray(samples, dtype=float)
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return {
+        "n": len(samples),
+        "min": round(float(samples.min()), 4),
+        "p50": round(float(p50), 4),
+        "p90": round(float(p90), 4),
+        "p99": round(float(p99), 4),
+        "max": round(float(samples.max()), 4),
+        "mean": round(float(samples.mean()), 4),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(client, cache, repeat):
+    report = {"load": {}, "plots": {}}
+    for mode, cold in (("cold", True), ("cached", False)):
+        runs = []
+        for _ in range(repeat):
+            reset(cache, cold)
+            runs.append(load(client))
+        reset(cache, cold)
+        peak = traced_peak(lambda: load(client))
+        stages = sorted({stage for _, s in runs for stage in s})
+        report["load"][mode] = {
+            "seconds": summary([seconds for seconds, _ in runs]),
+            "stages": {stage: summary([s.get(stage, 0.0) for _, s in runs]) for stage in stages},
+            "peak_mib": round(peak, 1),
+        }
+        print(f"load ({mode}): p50 {report['load'][mode]['seconds']['p50']:.3f}s, peak {peak:.1f} MiB")
+
+    for plot_type, query in PLOTS:
+        query = dict(query, plotType=plot_type)
+        render(client, query)   # first render pays for the lazy plotting imports
+        times = [render(client, query) for _ in range(repeat)]
+        peak = traced_peak(lambda: render(client, query))
+        report["plots"][plot_type] = {"query": query, "seconds": summary(times), "peak_mib": round(peak, 1)}
+        print(f"/plot {plot_type}: p50 {report['plots'][plot_type]['seconds']['p50']:.3f}s, peak {peak:.1f} MiB")
+    report["max_rss_mib"] = round(msy._peak_rss() / 2**20, 1)
+    return report
+
+
+def flatten(report):
+    # one p50 or peak per line of the comparison table
+    rows = {}
+    for mode, entry in report["load"].items():
+        rows[f"load {mode}"] = entry["seconds"]["p50"]
+        rows[f"load {mode} peak MiB"] = entry["peak_mib"]
+        for stage, stats in entry["stages"].items():
+            rows[f"load {mode} {stage}"] = stats["p50"]
+    for plot_type, entry in report["plots"].items():
+        rows[f"plot {plot_type}"] = entry["seconds"]["p50"]
+        rows[f"plot {plot_type} peak MiB"] = entry["peak_mib"]
+    rows["max RSS MiB"] = report["max_rss_mib"]
+    return rows
+
+
+def compare(baseline, report):
+    old, new = flatten(baseline), flatten(report)
+    print(f"\n{'p50 seconds / MiB':<44} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name in {**old, **new}:
+        a, b = old.get(name), new.get(name)
+        change = f"{100 * (b - a) / a:>+7.0f}%" if a and b is not None else ""
+        print(f"{name:<44} {'-' if a is None else a:>10} {'-' if b is None else b:>10} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", help="existing data folder (default: write a synthetic one)")
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--ingredients", type=int, default=18)
+    parser.add_argument("--shipment-rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default="benchmark-report.json")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = args.data
+        if data is None:
+            data = os.path.join(tmp, "data")
+            write_dataset(data, args.months, args.items, args.ingredients, args.shipment_rows, args.seed)
+        use_folders(os.path.abspath(data), os.path.join(tmp, "cache"))
+        report = run(msy.app.test_client(), msy.CACHE_FOLDER, args.repeat)
+
+    report["meta"] = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "ingest_workers": msy.INGEST_WORKERS,
+        "plot_workers": msy.PLOT_WORKERS,
+        "repeat": args.repeat,
+    }
+    report["input"] = (
+        {"data": os.path.abspath(args.data)} if args.data else
+        {"months": args.months, "items": args.items, "ingredients": args.ingredients,
+         "shipment_rows": args.shipment_rows, "seed": args.seed}
+    )
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
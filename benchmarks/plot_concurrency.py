@@ -0,0 +1,66 @@
+# plot_concurrency.py
+# Throughput of /plot as the render pool grows.
+#
+#   python benchmarks/plot_concurrency.py --requests 48 --workers 1 2 4 8
+#   python benchmarks/plot_concurrency.py --executor process
+#
+# Loads a folder written by synthetic_data.py through POST /upload, so no
+# data/ folder is needed, and renders the same plots as pipeline.py.
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pipeline import PLOTS, load, reset, use_folders
+from synthetic_data import write_dataset
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import app as msy  # noqa: E402
+
+
+def run(requests, workers, clients, executor="thread"):
+    if executor == "process":
+        msy.render_pool = ProcessPoolExecutor(max_workers=workers, mp_context=msy.PROCESS_CONTEXT)
+    else:
+        msy.render_pool = ThreadPoolExecutor(max_workers=workers)
+
+    def one(i):
+        plot_type, query = PLOTS[i % len(PLOTS)]
+        response = msy.app.test_client().get("/plot", query_string=dict(query, plotType=plot_type))
+        assert response.status_code == 200, response.data
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    msy.render_pool.shutdown()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_dataset(os.path.join(tmp, "data"), items=args.items)
+        use_folders(os.path.join(tmp, "data"), os.path.join(tmp, "cache"))
+        reset(msy.CACHE_FOLDER, cold=True)
+        load(msy.app.test_client())    # waits for the model fit, which would compete with rendering
+    msy.PLOT_CACHE_SIZE = 0  # measure rendering, not cache hits
+
+    run(len(PLOTS), 1, 1)  # warm up fonts and seaborn
+    print(f"{'workers':>8} {'seconds':>9} {'plots/s':>9}  ({args.executor})")
+    for workers in args.workers:
+        elapsed = run(args.requests, workers, args.clients, args.executor)
+        print(f"{workers:>8} {elapsed:>9.2f} {args.requests / elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# shipment_ingest.py
+# Peak memory of matching a shipment log read whole versus streamed in chunks.
+#
+#   python benchmarks/shipment_ingest.py --rows 100000 1000000 4000000
+#
+# Writes multi-location shipment logs with synthetic_data.py to a temporary
+# folder, so no data/ folder is needed.
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from synthetic_data import ingredient_table, write_shipments
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import app as msy  # noqa: E402
+
+
+INGREDIENTS = ingredient_table(18)
+RECIPE_COLUMNS = [column for column, _, _ in INGREDIENTS]
+
+
+def match(path, chunksize):
+    return msy.match_shipment_rows(RECIPE_COLUMNS, msy.read_shipments(path, chunksize))
+
+
+def measure(path, chunksize):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = match(path, chunksize)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunk", type=int, default=msy.SHIPMENT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'MiB':>7} {'whole s':>8} {'whole MiB':>10} {'chunked s':>10} {'chunked MiB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = write_shipments(tmp, np.random.default_rng(0), rows, INGREDIENTS)
+            whole_s, whole_peak, expected = measure(path, rows + 1)  # one chunk: the whole file
+            chunk_s, chunk_peak, got = measure(path, args.chunk)
+            assert expected.equals(got), "chunked result differs from a whole-file read"
+            print(
+                f"{rows:>9} {os.path.getsize(path) / 2**20:>7.1f} {whole_s:>8.2f} {whole_peak / 2**20:>10.1f}"
+                f" {chunk_s:>10.2f} {chunk_peak / 2**20:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# startup.py
+# Boot cost of a fresh server process: import time, RSS, and which heavy
+# modules each of the first requests pulls in.
+#
+#   python benchmarks/startup.py --repeat 5
+#   python benchmarks/startup.py --data data --prewarm
+#
+# Every run is a new interpreter, so nothing is shared between runs. Without
+# --data only / and /get_dataframe_columns are exercised.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+HEAVY = ("matplotlib", "seaborn", "statsmodels", "sklearn", "scipy")
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def child(data, settle):
+    # runs inside the fresh interpreter; prints one JSON line
+    steps = []
+
+    def step(name, fn):
+        start = time.perf_counter()
+        status = fn()
+        steps.append({
+            "step": name,
+            "seconds": time.perf_counter() - start,
+            "status": status,
+            "rss": rss_bytes(),
+            "heavy": [m for m in HEAVY if m in sys.modules],
+        })
+
+    sys.path.insert(0, ROOT)
+    step("import app", lambda: __import__("app") and None)
+    import app as msy
+
+    client = msy.app.test_client()
+    step("GET /", lambda: client.get("/").status_code)
+    step("POST /get_dataframe_columns",
+         lambda: client.post("/get_dataframe_columns", json={"groupBy": "Item"}).status_code)
+    if data:
+        step("POST /upload", lambda: client.post("/upload?wait=1").status_code)
+        # idle time before the first chart request, as on a freshly booted worker
+        step(f"idle {settle:g}s", lambda: time.sleep(settle))
+        plot = {"groupBy": "Item", "x": "month", "y": "Count", "plotType": "barplot"}
+        step("first /plot", lambda: client.get("/plot", query_string=plot).status_code)
+    print(json.dumps(steps))
+
+
+def run(data, prewarm, settle):
+    env = dict(os.environ)
+    env["MSY_PREWARM"] = "1" if prewarm else "0"
+    if data:
+        env["MSY_DATA_FOLDER"] = os.path.abspath(data)
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--settle", str(settle)]
+        + (["--data", data] if data else []),
+        env=env, capture_output=True, text=True, check=True, cwd=ROOT,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data", help="data folder with month workbooks and the CSVs")
+    parser.add_argument("--prewarm", action="store_true", help="also measure with MSY_PREWARM=1")
+    parser.add_argument("--settle", type=float, default=5.0, help="seconds between /upload and the first /plot")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.data, args.settle)
+
+    for prewarm in ([False, True] if args.prewarm else [False]):
+        runs = [run(args.data, prewarm, args.settle) for _ in range(args.repeat)]
+        print(f"MSY_PREWARM={int(prewarm)} (median of {args.repeat})")
+        print(f"  {'step':<30} {'seconds':>8} {'RSS MiB':>8}  heavy modules loaded")
+        for k, first in enumerate(runs[0]):
+            seconds = statistics.median(r[k]["seconds"] for r in runs)
+            rss = statistics.median(r[k]["rss"] for r in runs) / 2**20
+            print(f"  {first['step']:<30} {seconds:>8.3f} {rss:>8.1f}  {', '.join(first['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# synthetic_data.py
+# Writes a data folder the app can load, at any scale: one
+# <Month>_Data_Matrix.xlsx workbook per month (Group, Category and Item
+# sheets), the ingredient CSV and the shipment CSV.
+#
+#   python benchmarks/synthetic_data.py bench-data --months 6 --items 500 \
+#       --ingredients 40 --shipment-rows 100000
+#   MSY_DATA_FOLDER=bench-data python app.py
+#
+# The same arguments and --seed always give the same data. Sheet totals are
+# consistent: categories sum their items and groups sum their categories.
+# The other benchmarks build their inputs from the same generators
+# (month_sheets, recipe_table, shipment_frame, usage_matrix) in memory.
+import argparse
+import calendar
+import os
+
+import numpy as np
+import pandas as pd
+
+INGREDIENTS = [
+    ("Braised Beef used (g)", "Beef", "lbs"),
+    ("Braised Chicken(g)", "Chicken", "lbs"),
+    ("Braised Pork(g)", "Pork", "lbs"),
+    ("Egg(count)", "Egg", "Dozen"),
+    ("Rice(g)", "Rice", "lbs"),
+    ("Ramen (count)", "Ramen", "pcs"),
+    ("Rice Noodles(g)", "Rice Noodles", "lbs"),
+    ("chicken thigh (pcs)", "Chicken Thighs", "pcs"),
+    ("Chicken Wings (pcs)", "Chicken Wings", "pcs"),
+    ("flour (g)", "Flour", "lbs"),
+    ("Pickle Cabbage", "Pickle Cabbage", "lbs"),
+    ("Green Onion", "Green Onion", "lbs"),
+    ("Cilantro", "Cilantro", "lbs"),
+    ("White Onion", "White onion", "lbs"),
+    ("Peas(g)", "Peas + Carrot", "lbs"),
+    ("Boychoy(g)", "Boychoy", "lbs"),
+    ("Tapioca Starch", "Tapioca Starch", "lbs"),
+    ("Eggplant(g)", "Eggplant", "lbs"),
+]
+GROUPS = ["Lunch", "Dinner", "Drinks", "Sides"]
+CATEGORIES = ["Noodles", "Rice", "Soup", "Tea", "Snacks", "Dumplings", "Specials", "Desserts"]
+FREQUENCIES = ["weekly", "weekly", "biweekly", "monthly"]
+
+
+def ingredient_table(count):
+    # the real ingredients first, then numbered ones shaped the same way
+    rows = INGREDIENTS[:count]
+    for k in range(len(rows), count):
+        name = f"Spice {k + 1}"
+        rows.append((f"{name} (g)", name, "lbs"))
+    return rows
+
+
+def currency(values):
+    return [f"${v:,.2f}" for v in values]
+
+
+def item_sales(rng, months, items, categories):
+    # item popularity is long-tailed and shifts a little from month to month;
+    # counts is months x items
+    names = np.asarray([f"Item {i + 1}" for i in range(items)], dtype=object)
+    price = np.round(rng.lognormal(2.5, 0.4, items), 2)
+    popularity = 1 / np.arange(1, items + 1) ** 0.8
+    item_category = rng.integers(0, len(categories), items)
+    counts = np.stack([
+        rng.poisson(popularity * rng.uniform(0.8, 1.2, items) * 300 * items ** 0.5) for _ in range(months)
+    ])
+    return names, price, item_category, counts
+
+
+def month_sheets(rng, months, items, categories=CATEGORIES, groups=GROUPS):
+    # (month name, {sheet: frame}) per month, Amount still numeric
+    names, price, item_category, counts = item_sales(rng, months, items, categories)
+    category_group = np.arange(len(categories)) % len(groups)
+    sheets = []
+    for m, count in enumerate(counts):
+        amount = count * price
+        by_category = np.bincount(item_category, weights=count, minlength=len(categories))
+        amount_category = np.bincount(item_category, weights=amount, minlength=len(categories))
+        by_group = np.bincount(category_group, weights=by_category, minlength=len(groups))
+        amount_group = np.bincount(category_group, weights=amount_category, minlength=len(groups))
+        sheets.append((calendar.month_name[m % 12 + 1], {
+            "Group": pd.DataFrame({"Group": groups, "Count": by_group.astype(int), "Amount": amount_group}),
+            "Category": pd.DataFrame({
+                "Category": categories, "Count": by_category.astype(int), "Amount": amount_category,
+            }),
+            "Item": pd.DataFrame({"Item Name": names, "Count": count, "Amount": amount}),
+        }))
+    return names, sheets
+
+
+def write_months(out, rng, months, items, categories, groups):
+    names, sheets = month_sheets(rng, months, items, categories, groups)
+    paths = []
+    for month, frames in sheets:
+        path = os.path.join(out, f"{month}_Data_Matrix.xlsx")
+        with pd.ExcelWriter(path) as writer:
+            for sheet, df in frames.items():
+                df.assign(Amount=currency(df["Amount"])).to_excel(writer, sheet_name=sheet, index=False)
+        paths.append(path)
+    return names, paths
+
+
+def recipe_table(rng, items, ingredients):
+    # items x ingredients: two to five ingredients per item, amounts per
+    # serving, NaN where unused
+    table = np.full((items, ingredients), np.nan)
+    for row in range(items):
+        used = rng.choice(ingredients, min(ingredients, rng.integers(2, 6)), replace=False)
+        table[row, used] = rng.integers(1, 250, len(used))
+    return table
+
+
+def write_recipes(out, rng, names, ingredients):
+    recipes = pd.DataFrame(
+        recipe_table(rng, len(names), len(ingredients)), columns=[column for column, _, _ in ingredients]
+    )
+    recipes.insert(0, "Item name", names)
+    path = os.path.join(out, "MSY Data - Ingredient.csv")
+    recipes.to_csv(path, index=False)
+    return path
+
+
+def shipment_frame(rng, rows, ingredients):
+    # one line per location, ingredient and delivery schedule
+    k = rng.integers(0, len(ingredients), rows)
+    return pd.DataFrame({
+        "Location": rng.integers(1, max(2, rows // len(ingredients)) + 1, rows),
+        "Ingredient": np.asarray([name for _, name, _ in ingredients], dtype=object)[k],
+        "Quantity per shipment": rng.choice([1, 3, 5, 10, 20, 40], rows),
+        "Unit of shipment": np.asarray([unit for _, _, unit in ingredients], dtype=object)[k],
+        "Number of shipments": rng.integers(1, 4, rows),
+        "frequency": rng.choice(FREQUENCIES, rows),
+    })
+
+
+def write_shipments(out, rng, rows, ingredients):
+    path = os.path.join(out, "MSY Data - Shipment.csv")
+    shipment_frame(rng, rows, ingredients).to_csv(path, index=False)
+    return path
+
+
+def usage_matrix(rng, months, items, ingredients):
+    # months x ingredients, the way the app builds its usage cube: item
+    # counts per month times the recipe table
+    _, _, _, counts = item_sales(rng, months, items, CATEGORIES)
+    return counts @ np.nan_to_num(recipe_table(rng, items, ingredients))
+
+
+def write_dataset(out, months=6, items=100, ingredients=18, shipment_rows=18, seed=0):
+    # returns the paths written, in the order the app reads them
+    if not 1 <= months <= 12:
+        raise ValueError("months must be between 1 and 12 (month sheets carry no year)")
+    os.makedirs(out, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    table = ingredient_table(ingredients)
+    names, paths = write_months(out, rng, months, items, CATEGORIES, GROUPS)
+    paths.append(write_recipes(out, rng, names, table))
+    paths.append(write_shipments(out, rng, shipment_rows, table))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("out", help="folder to write (created if missing)")
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--ingredients", type=int, default=18)
+    parser.add_argument("--shipment-rows", type=int, default=18)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = write_dataset(args.out, args.months, args.items, args.ingredients, args.shipment_rows, args.seed)
+    for path in paths:
+        print(f"{os.path.getsize(path) / 2**20:>8.2f} MiB  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,590 @@
+// MSY dashboard UI. Compiled ahead of time by frontend/build.py into
+// static/app.min.js, which the server fingerprints and serves.
+
+// File Upload Tab (now auto-loads default data)
+const FileUpload = ({ setColumnNames, setTargetVariable, setDataset }) => {
+    const [loading, setLoading] = React.useState(false);
+    const [status, setStatus] = React.useState("Loading default data...");
+
+    const [stages, setStages] = React.useState([]);
+
+    React.useEffect(() => {
+        let stopped = false;
+        let source = null;
+
+        // returns true once the job has finished either way
+        const update = (job) => {
+        setStages(job.stages);
+        if (job.state === "done") {
+            const data = job.result;
+            setDataset(data.dataset);
+            setColumnNames(data.columns);
+            setTargetVariable(data.columns[0]);
+            setStatus(data.note || "Default data loaded successfully.");
+            setLoading(false);
+            return true;
+        }
+        if (job.state === "failed") {
+            setStatus(job.error || "Failed to load default data.");
+            setLoading(false);
+            return true;
+        }
+        return false;
+        };
+
+        const poll = async (id) => {
+        try {
+            const job = await (await fetch("/upload/" + id)).json();
+            if (update(job)) return;
+        } catch (error) {
+            console.error("Error polling load job:", error);
+        }
+        if (!stopped) setTimeout(() => poll(id), 1000);
+        };
+
+        const fetchDefaultData = async () => {
+        setLoading(true);
+        try {
+            const response = await fetch("/upload", { method: "POST" }); // no file, triggers default
+            const { job } = await response.json();
+            if (!window.EventSource) return poll(job);
+            // progress is pushed as server-sent events; polling is the fallback
+            source = new EventSource("/upload/" + job + "/events");
+            source.onmessage = (e) => {
+            if (update(JSON.parse(e.data))) source.close();
+            };
+            source.onerror = () => {
+            source.close();
+            if (!stopped) poll(job);
+            };
+        } catch (error) {
+            console.error("Error loading default data:", error);
+            setStatus("An error occurred while loading default data.");
+            setLoading(false);
+        }
+        };
+
+        fetchDefaultData();
+        return () => {
+        stopped = true;
+        if (source) source.close();
+        };
+    }, [setColumnNames, setTargetVariable, setDataset]);
+
+    return (
+        <div>
+        <h2>Data Load Status</h2>
+        <p>{loading ? "Loading default data..." : status}</p>
+        {stages.length > 0 && (
+            <ul>
+            {stages.map((s) => (
+                <li key={s.name}>
+                {s.name}: {s.status}
+                {s.total ? ` (${s.done}/${s.total})` : ""}
+                {s.seconds != null ? ` ${s.seconds}s` : ""}
+                </li>
+            ))}
+            </ul>
+        )}
+        </div>
+    );
+};
+
+
+
+
+
+// Client-side chart drawn from /plot_data (bar, line or pie as SVG)
+const ClientChart = ({ data, plotType }) => {
+    const W = 640, H = 400, M = { top: 20, right: 20, bottom: 90, left: 60 };
+    const fmt = (v) => (typeof v === "number" ? +v.toPrecision(4) : String(v));
+
+    if (plotType === "pie chart") {
+        const { labels, values } = data.counts;
+        const total = values.reduce((a, b) => a + b, 0) || 1;
+        const r = 150, cx = W / 2, cy = H / 2;
+        let angle = -Math.PI / 2;
+        return (
+            <svg width={W} height={H}>
+            {values.map((v, i) => {
+                const start = angle;
+                angle += (2 * Math.PI * v) / total;
+                const large = angle - start > Math.PI ? 1 : 0;
+                const [x0, y0] = [cx + r * Math.cos(start), cy + r * Math.sin(start)];
+                const [x1, y1] = [cx + r * Math.cos(angle), cy + r * Math.sin(angle)];
+                const mid = (start + angle) / 2;
+                const path = values.length === 1
+                    ? `M ${cx - r} ${cy} A ${r} ${r} 0 1 1 ${cx + r} ${cy} A ${r} ${r} 0 1 1 ${cx - r} ${cy}`
+                    : `M ${cx} ${cy} L ${x0} ${y0} A ${r} ${r} 0 ${large} 1 ${x1} ${y1} Z`;
+                return (
+                    <g key={i}>
+                    <path d={path} fill={`hsl(${(i * 47) % 360}, 60%, 60%)`} stroke="#fff" />
+                    <text x={cx + (r + 20) * Math.cos(mid)} y={cy + (r + 20) * Math.sin(mid)}
+                          fontSize="11" textAnchor={Math.cos(mid) < 0 ? "end" : "start"}>
+                        {fmt(labels[i])} ({((100 * v) / total).toFixed(1)}%)
+                    </text>
+                    </g>
+                );
+            })}
+            </svg>
+        );
+    }
+
+    if (!data.series) {
+        return <p>Bar and line charts need a numeric Y variable.</p>;
+    }
+    const { x: xs, mean, low, high } = data.series;
+    const tops = high.map((h, i) => (h === null ? mean[i] : h));
+    const bottoms = low.map((l, i) => (l === null ? mean[i] : l));
+    const yMax = Math.max(0, ...tops), yMin = Math.min(0, ...bottoms);
+    const plotW = W - M.left - M.right, plotH = H - M.top - M.bottom;
+    const band = plotW / Math.max(xs.length, 1);
+    const px = (i) => M.left + band * (i + 0.5);
+    const py = (v) => M.top + plotH - ((v - yMin) / (yMax - yMin || 1)) * plotH;
+    const ticks = [0, 0.25, 0.5, 0.75, 1].map((t) => yMin + t * (yMax - yMin));
+
+    return (
+        <svg width={W} height={H}>
+        {ticks.map((t, i) => (
+            <g key={i}>
+            <line x1={M.left} x2={W - M.right} y1={py(t)} y2={py(t)} stroke="#eee" />
+            <text x={M.left - 6} y={py(t) + 4} fontSize="11" textAnchor="end">{fmt(t)}</text>
+            </g>
+        ))}
+        {plotType === "barplot" && mean.map((m, i) => (
+            <g key={i}>
+            <rect x={px(i) - band * 0.4} width={band * 0.8} y={Math.min(py(m), py(0))}
+                  height={Math.abs(py(0) - py(m))} fill="#3274a1" />
+            {low[i] !== null && (
+                <line x1={px(i)} x2={px(i)} y1={py(low[i])} y2={py(high[i])} stroke="#424242" strokeWidth="2" />
+            )}
+            </g>
+        ))}
+        {plotType === "line plot" && (
+            <React.Fragment>
+            <polygon fill="#3274a1" opacity="0.2"
+                points={tops.map((h, i) => `${px(i)},${py(h)}`)
+                    .concat(bottoms.map((l, i) => `${px(i)},${py(l)}`).reverse()).join(" ")} />
+            <polyline fill="none" stroke="#3274a1" strokeWidth="2"
+                points={mean.map((m, i) => `${px(i)},${py(m)}`).join(" ")} />
+            </React.Fragment>
+        )}
+        {xs.map((v, i) => (
+            <text key={i} x={px(i)} y={H - M.bottom + 12} fontSize="11" textAnchor="end"
+                  transform={`rotate(-90 ${px(i)} ${H - M.bottom + 12})`}>{fmt(v)}</text>
+        ))}
+        <text x={W / 2} y={14} fontSize="13" textAnchor="middle">{`${data.y} by ${data.x}`}</text>
+        </svg>
+    );
+};
+
+
+
+
+
+// Graphing Tab
+const Graphing = ({ modelBuilt, modelTargets, dataset }) => {
+    const [x, setX] = React.useState("");
+    const [y, setY] = React.useState("");
+    const [groupBy, setGroupBy] = React.useState("");
+    const [plotType, setPlotType] = React.useState("scatterplot");
+    const [errorbar, setErrorbar] = React.useState("ci");
+    const [scatterMode, setScatterMode] = React.useState("auto");
+    const [pointsNote, setPointsNote] = React.useState("");
+    const [clientSide, setClientSide] = React.useState(false);
+    const [chartData, setChartData] = React.useState(null);
+    const [note, setNote] = React.useState("");
+    const [columnOptions, setColumnOptions] = React.useState([]);
+    const [imgUrl, setImgUrl] = React.useState("");
+    const [mse, setMse] = React.useState(null);
+    const [varVal, setVar] = React.useState(null);
+    const [loadingPlot, setLoadingPlot] = React.useState(false);
+    const [loadingResults, setLoadingResults] = React.useState(false);
+
+    // Fetch columns when "Group By" changes
+    React.useEffect(() => {
+        if (!groupBy) {
+        setColumnOptions([]);
+        return;
+        }
+
+        fetch("/get_dataframe_columns", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ groupBy, dataset }),
+        })
+        .then((r) => r.json())
+        .then((data) => {
+            setColumnOptions(data.columns || []);
+        })
+        .catch((e) => console.error(e));
+    }, [groupBy, dataset]);
+
+    const handlePlot = async () => {
+        setNote(""); // clear old warnings
+
+        if (!x && !y) {
+        alert("Please select at least one variable.");
+        return;
+        }
+
+        // Validation rules
+        if (plotType === "pie chart" && x && y) {
+        setNote("Pie chart can only have one variable (choose either X or Y, not both).");
+        return;
+        }
+
+        if (plotType !== "pie chart" && !x && !y) {
+        setNote("Please select at least one variable for this plot type.");
+        return;
+        }
+
+        setLoadingPlot(true);
+        if (clientSide && plotType !== "scatterplot") {
+        try {
+            // one fetch per variable choice; switching chart type re-renders locally
+            const params = new URLSearchParams({ x, y, groupBy, dataset });
+            const response = await fetch("/plot_data?" + params.toString());
+            if (!response.ok) {
+            alert("Data error: " + (await response.text()));
+            return;
+            }
+            setChartData(await response.json());
+            setImgUrl("");
+        } catch (e) {
+            console.error(e);
+        } finally {
+            setLoadingPlot(false);
+        }
+        return;
+        }
+
+        setChartData(null);
+        try {
+        // GET so the browser can revalidate a cached chart with its ETag
+        const params = new URLSearchParams({ x, y, groupBy, plotType, errorbar, scatterMode, dataset });
+        const response = await fetch("/plot?" + params.toString());
+
+        if (!response.ok) {
+            const txt = await response.text();
+            alert("Plot error: " + txt);
+            return;
+        }
+
+        const blob = await response.blob();
+        setImgUrl(URL.createObjectURL(blob));
+
+        const drawn = response.headers.get("X-Points-Drawn");
+        const total = response.headers.get("X-Points-Total");
+        setPointsNote(
+            drawn && total
+            ? `${response.headers.get("X-Scatter-Mode")}: ${drawn} drawn of ${total} points`
+            : ""
+        );
+        } catch (e) {
+        console.error(e);
+        } finally {
+        setLoadingPlot(false);
+        }
+    };
+
+    // Results panel (unchanged)
+    const [showResultsPanel, setShowResultsPanel] = React.useState(false);
+    const [selectedDate, setSelectedDate] = React.useState("");
+    const [selectedModelTarget, setSelectedModelTarget] = React.useState("");
+    const [resultsImgUrl, setResultsImgUrl] = React.useState("");
+    const [explainedVar, setExplainedVar] = React.useState(null);
+
+    const handleDisplayResultsClick = () => setShowResultsPanel(true);
+
+    const handleShowResults = async () => {
+        if (!selectedDate || !selectedModelTarget) {
+        alert("Please choose a date and target.");
+        return;
+        }
+
+        setLoadingResults(true);
+        try {
+        const response = await fetch("/plot_results", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ date: selectedDate, target: selectedModelTarget, dataset }),
+        });
+
+        if (!response.ok) {
+            const txt = await response.text();
+            alert("Error: " + txt);
+            return;
+        }
+
+        const data = await response.json();
+        if (!data.image) {
+            alert("No image returned from server.");
+            return;
+        }
+
+        setResultsImgUrl("data:image/png;base64," + data.image);
+        setMse(typeof data.mse === "number" ? data.mse.toFixed(4) : "N/A");
+        setVar(typeof data.variance === "number" ? data.variance.toFixed(4) : "N/A");
+        setExplainedVar(
+            typeof data.explained_variance === "number"
+            ? data.explained_variance.toFixed(4)
+            : "N/A"
+        );
+        } catch (e) {
+        console.error(e);
+        } finally {
+        setLoadingResults(false);
+        }
+    };
+
+    return (
+        <div>
+        <h2>Graphing</h2>
+
+        {!modelBuilt && (
+            <React.Fragment>
+            <div>
+                <label>Group By: </label>
+                <select value={groupBy} onChange={(e) => setGroupBy(e.target.value)}>
+                <option value="">--Select--</option>
+                <option value="Group">Group</option>
+                <option value="Category">Category</option>
+                <option value="Item">Item</option>
+                </select>
+            </div>
+
+            {groupBy && (
+                <React.Fragment>
+                <div style={{ marginTop: 10 }}>
+                    <label>Plot Type: </label>
+                    <select value={plotType} onChange={(e) => setPlotType(e.target.value)}>
+                    <option value="barplot">Barplot</option>
+                    <option value="scatterplot">Scatterplot</option>
+                    <option value="line plot">Line Plot</option>
+                    <option value="pie chart">Pie Chart</option>
+                    </select>
+
+                    {(plotType === "barplot" || plotType === "line plot") && (
+                    <React.Fragment>
+                        <label> Error Bars: </label>
+                        <select value={errorbar} onChange={(e) => setErrorbar(e.target.value)}>
+                        <option value="ci">95% CI (fast)</option>
+                        <option value="none">None</option>
+                        <option value="bootstrap">Bootstrap (slow)</option>
+                        </select>
+                    </React.Fragment>
+                    )}
+
+                    {plotType === "scatterplot" && (
+                    <React.Fragment>
+                        <label> Points: </label>
+                        <select value={scatterMode} onChange={(e) => setScatterMode(e.target.value)}>
+                        <option value="auto">Auto</option>
+                        <option value="full">All points</option>
+                        <option value="sample">Sample</option>
+                        <option value="hexbin">Hexbin density</option>
+                        </select>
+                    </React.Fragment>
+                    )}
+                </div>
+
+                <div style={{ marginTop: 10 }}>
+                    <label>X: </label>
+                    <select value={x} onChange={(e) => setX(e.target.value)}>
+                    <option value="">--Select--</option>
+                    {columnOptions.map((col) => (
+                        <option key={col} value={col}>
+                        {col}
+                        </option>
+                    ))}
+                    </select>
+
+                    <label> Y: </label>
+                    <select value={y} onChange={(e) => setY(e.target.value)}>
+                    <option value="">--Select--</option>
+                    {columnOptions.map((col) => (
+                        <option key={col} value={col}>
+                        {col}
+                        </option>
+                    ))}
+                    </select>
+                </div>
+                </React.Fragment>
+            )}
+
+            {groupBy && (
+                <div style={{ marginTop: 10 }}>
+                <label>
+                    <input type="checkbox" checked={clientSide}
+                           onChange={(e) => { setClientSide(e.target.checked); setChartData(null); }} />
+                    Draw bar/line/pie charts in the browser
+                </label>
+                </div>
+            )}
+
+            {note && (
+                <div style={{ marginTop: "8px", color: "darkorange", fontWeight: "bold" }}>
+                {note}
+                </div>
+            )}
+
+            <div style={{ marginTop: "10px" }}>
+                <button onClick={handlePlot} disabled={loadingPlot || !groupBy}>
+                {loadingPlot ? "Plotting..." : "Generate Plot"}
+                </button>
+            </div>
+
+            {chartData && plotType !== "scatterplot" && (
+                <div style={{ marginTop: "20px" }}>
+                <ClientChart data={chartData} plotType={plotType} />
+                </div>
+            )}
+
+            {imgUrl && !chartData && (
+                <div style={{ marginTop: "20px" }}>
+                <img src={imgUrl} alt="Plot" style={{ maxWidth: "100%" }} />
+                {pointsNote && <div style={{ color: "#555" }}>{pointsNote}</div>}
+                </div>
+            )}
+            </React.Fragment>
+        )}
+
+        {modelBuilt && (
+            <div style={{ marginTop: 10 }}>
+            <button onClick={handleDisplayResultsClick}>Display Results</button>
+            </div>
+        )}
+
+        {modelBuilt && showResultsPanel && (
+            <div style={{ marginTop: 12 }}>
+            <div>
+                <label>Date: </label>
+                <input
+                type="date"
+                value={selectedDate}
+                onChange={(e) => setSelectedDate(e.target.value)}
+                />
+                <label> Target: </label>
+                <select
+                value={selectedModelTarget}
+                onChange={(e) => setSelectedModelTarget(e.target.value)}
+                >
+                <option value="">--Select--</option>
+                {modelTargets.map((t, i) => (
+                    <option key={i} value={t}>
+                    {t}
+                    </option>
+                ))}
+                </select>
+                <button
+                onClick={handleShowResults}
+                disabled={loadingResults}
+                style={{ marginLeft: 10 }}
+                >
+                {loadingResults ? "Plotting..." : "Show Results"}
+                </button>
+            </div>
+
+            {resultsImgUrl && (
+                <div
+                style={{
+                    display: "flex",
+                    alignItems: "flex-start",
+                    marginTop: 16,
+                    gap: "2rem",
+                }}
+                >
+                <img src={resultsImgUrl} alt="Results" style={{ maxWidth: "65%" }} />
+                <div style={{ fontSize: "1rem", lineHeight: "1.6" }}>
+                    <strong>MSE:</strong> {mse}
+                    <br />
+                    <strong>Variance:</strong> {varVal}
+                    <br />
+                    <strong>Explained Variance:</strong> {explainedVar}
+                </div>
+                </div>
+            )}
+            </div>
+        )}
+        </div>
+    );
+};
+
+
+
+
+// Application
+const App = () => {
+  const [activeTab, setActiveTab] = React.useState("File Upload");
+  const [columnNames, setColumnNames] = React.useState([]);
+  const [targetVariable, setTargetVariable] = React.useState("");
+  const [modelBuilt, setModelBuilt] = React.useState(false);
+  const [modelTargets, setModelTargets] = React.useState([]);
+  // the version this page loaded; later loads elsewhere don't change it
+  const [dataset, setDataset] = React.useState("");
+
+
+  const handleModelBuilt = (targets) => {
+    setModelBuilt(true);
+    setModelTargets(targets || []);
+
+
+    setActiveTab("Graphing");
+  };
+
+  // forecast models are fitted in the background after each load
+  React.useEffect(() => {
+    if (!dataset) return;
+    let stopped = false;
+    const poll = async () => {
+      try {
+        const data = await (await fetch("/model_status?dataset=" + dataset)).json();
+        if (data.ready) {
+          setModelTargets(data.targets);
+          return;
+        }
+      } catch (e) {
+        console.error(e);
+      }
+      if (!stopped) setTimeout(poll, 3000);
+    };
+    poll();
+    return () => { stopped = true; };
+  }, [dataset]);
+
+
+  return (
+    <div>
+      <div className="top-bar">
+        <div>
+          <button onClick={() => setActiveTab("File Upload")}>File Upload</button>
+          <button onClick={() => setActiveTab("Graphing")}>Graphing</button>
+        </div>
+        <div>
+          {/* could show modelBuilt indicator */}
+          {modelBuilt ? <strong>Model built</strong> : null}
+          {modelTargets.length > 0 && !modelBuilt && (
+            <button onClick={() => handleModelBuilt(modelTargets)}>Model Results</button>
+          )}
+          {modelBuilt && (
+            <button onClick={() => setModelBuilt(false)} style={{ marginLeft: 10 }}>Back to Plots</button>
+          )}
+        </div>
+      </div>
+
+
+      <div style={{ padding: 12 }}>
+        {activeTab === "File Upload" && (
+          <FileUpload setColumnNames={setColumnNames} setTargetVariable={setTargetVariable} setDataset={setDataset} />
+        )}
+        {activeTab === "Graphing" && (
+          <Graphing columnNames={columnNames} modelBuilt={modelBuilt} modelTargets={modelTargets} dataset={dataset} />
+        )}
+      </div>
+    </div>
+  );
+};
+
+
+ReactDOM.createRoot(document.getElementById('root')).render(<App />);
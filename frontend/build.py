@@ -0,0 +1,36 @@
+# build.py
+# Compiles frontend/app.jsx into the minified static/app.min.js bundle.
+#
+#   pip install dukpy rjsmin
+#   python frontend/build.py
+#
+# Run after every change to app.jsx and commit the bundle with it. The bundle
+# records the hash of the source it was built from; the server warns at
+# startup when app.jsx no longer matches.
+import hashlib
+import os
+
+import dukpy
+import rjsmin
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "frontend", "app.jsx")
+BUNDLE = os.path.join(ROOT, "static", "app.min.js")
+
+
+def source_hash(source):
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def main():
+    with open(SOURCE, encoding="utf-8") as f:
+        source = f.read()
+    # JSX and ES2015 down to plain ES5 calls to React.createElement
+    code = rjsmin.jsmin(dukpy.jsx_compile(source))
+    with open(BUNDLE, "w", encoding="utf-8") as f:
+        f.write(f"/* app.jsx {source_hash(source)} */\n{code}\n")
+    print(f"Wrote {BUNDLE} ({len(code):,} bytes from {len(source):,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+/* app.jsx 6c23f65c420a7b93 */
+"use strict";var _slicedToArray=function(){function sliceIterator(arr,i){var _arr=[];var _n=true;var _d=false;var _e=undefined;try{for(var _i=arr[Symbol.iterator](),_s;!(_n=(_s=_i.next()).done);_n=true){_arr.push(_s.value);if(i&&_arr.length===i)break;}}catch(err){_d=true;_e=err;}finally{try{if(!_n&&_i["return"])_i["return"]();}finally{if(_d)throw _e;}}return _arr;}return function(arr,i){if(Array.isArray(arr)){return arr;}else if(Symbol.iterator in Object(arr)){return sliceIterator(arr,i);}else{throw new TypeError("Invalid attempt to destructure non-iterable instance");}};}();function _toConsumableArray(arr){if(Array.isArray(arr)){for(var i=0,arr2=Array(arr.length);i<arr.length;i++){arr2[i]=arr[i];}return arr2;}else{return Array.from(arr);}}
+var FileUpload=function FileUpload(_ref){var setColumnNames=_ref.setColumnNames,setTargetVariable=_ref.setTargetVariable,setDataset=_ref.setDataset;var _React$useState=React.useState(false),_React$useState2=_slicedToArray(_React$useState,2),loading=_React$useState2[0],setLoading=_React$useState2[1];var _React$useState3=React.useState("Loading default data..."),_React$useState4=_slicedToArray(_React$useState3,2),status=_React$useState4[0],setStatus=_React$useState4[1];var _React$useState5=React.useState([]),_React$useState6=_slicedToArray(_React$useState5,2),stages=_React$useState6[0],setStages=_React$useState6[1];React.useEffect(function(){var stopped=false;var source=null;var update=function update(job){setStages(job.stages);if(job.state==="done"){var data=job.result;setDataset(data.dataset);setColumnNames(data.columns);setTargetVariable(data.columns[0]);setStatus(data.note||"Default data loaded successfully.");setLoading(false);return true;}
+if(job.state==="failed"){setStatus(job.error||"Failed to load default data.");setLoading(false);return true;}
+return false;};var poll=async function poll(id){try{var job=await(await fetch("/upload/"+id)).json();if(update(job))return;}catch(error){console.error("Error polling load job:",error);}
+if(!stopped)setTimeout(function(){return poll(id);},1000);};var fetchDefaultData=async function fetchDefaultData(){setLoading(true);try{var response=await fetch("/upload",{method:"POST"});var _ref2=await response.json(),job=_ref2.job;if(!window.EventSource)return poll(job);source=new EventSource("/upload/"+job+"/events");source.onmessage=function(e){if(update(JSON.parse(e.data)))source.close();};source.onerror=function(){source.close();if(!stopped)poll(job);};}catch(error){console.error("Error loading default data:",error);setStatus("An error occurred while loading default data.");setLoading(false);}};fetchDefaultData();return function(){stopped=true;if(source)source.close();};},[setColumnNames,setTargetVariable,setDataset]);return React.createElement("div",null,React.createElement("h2",null,"Data Load Status"),React.createElement("p",null,loading?"Loading default data...":status),stages.length>0&&React.createElement("ul",null,stages.map(function(s){return React.createElement("li",{key:s.name},s.name,": ",s.status,s.total?" ("+s.done+"/"+s.total+")":"",s.seconds!=null?" "+s.seconds+"s":"");})));};var ClientChart=function ClientChart(_ref3){var data=_ref3.data,plotType=_ref3.plotType;var W=640,H=400,M={top:20,right:20,bottom:90,left:60};var fmt=function fmt(v){return typeof v==="number"?+v.toPrecision(4):String(v);};if(plotType==="pie chart"){var _data$counts=data.counts,labels=_data$counts.labels,values=_data$counts.values;var total=values.reduce(function(a,b){return a+b;},0)||1;var r=150,cx=W/2,cy=H/2;var angle=-Math.PI/2;return React.createElement("svg",{width:W,height:H},values.map(function(v,i){var start=angle;angle+=2*Math.PI*v/total;var large=angle-start>Math.PI?1:0;var x0=cx+r*Math.cos(start),y0=cy+r*Math.sin(start);var x1=cx+r*Math.cos(angle),y1=cy+r*Math.sin(angle);var mid=(start+angle)/2;var path=values.length===1?"M "+(cx-r)+" "+cy+" A "+r+" "+r+" 0 1 1 "+(cx+r)+" "+cy+" A "+r+" "+r+" 0 1 1 "+(cx-r)+" "+cy:"M "+cx+" "+cy+" L "+x0+" "+y0+" A "+r+" "+r+" 0 "+large+" 1 "+x1+" "+y1+" Z";return React.createElement("g",{key:i},React.createElement("path",{d:path,fill:"hsl("+i*47%360+", 60%, 60%)",stroke:"#fff"}),React.createElement("text",{x:cx+(r+20)*Math.cos(mid),y:cy+(r+20)*Math.sin(mid),fontSize:"11",textAnchor:Math.cos(mid)<0?"end":"start"},fmt(labels[i])," (",(100*v/total).toFixed(1),"%)"));}));}
+if(!data.series){return React.createElement("p",null,"Bar and line charts need a numeric Y variable.");}
+var _data$series=data.series,xs=_data$series.x,mean=_data$series.mean,low=_data$series.low,high=_data$series.high;var tops=high.map(function(h,i){return h===null?mean[i]:h;});var bottoms=low.map(function(l,i){return l===null?mean[i]:l;});var yMax=Math.max.apply(Math,[0].concat(_toConsumableArray(tops))),yMin=Math.min.apply(Math,[0].concat(_toConsumableArray(bottoms)));var plotW=W-M.left-M.right,plotH=H-M.top-M.bottom;var band=plotW/Math.max(xs.length,1);var px=function px(i){return M.left+band*(i+0.5);};var py=function py(v){return M.top+plotH-(v-yMin)/(yMax-yMin||1)*plotH;};var ticks=[0,0.25,0.5,0.75,1].map(function(t){return yMin+t*(yMax-yMin);});return React.createElement("svg",{width:W,height:H},ticks.map(function(t,i){return React.createElement("g",{key:i},React.createElement("line",{x1:M.left,x2:W-M.right,y1:py(t),y2:py(t),stroke:"#eee"}),React.createElement("text",{x:M.left-6,y:py(t)+4,fontSize:"11",textAnchor:"end"},fmt(t)));}),plotType==="barplot"&&mean.map(function(m,i){return React.createElement("g",{key:i},React.createElement("rect",{x:px(i)-band*0.4,width:band*0.8,y:Math.min(py(m),py(0)),height:Math.abs(py(0)-py(m)),fill:"#3274a1"}),low[i]!==null&&React.createElement("line",{x1:px(i),x2:px(i),y1:py(low[i]),y2:py(high[i]),stroke:"#424242",strokeWidth:"2"}));}),plotType==="line plot"&&React.createElement(React.Fragment,null,React.createElement("polygon",{fill:"#3274a1",opacity:"0.2",points:tops.map(function(h,i){return px(i)+","+py(h);}).concat(bottoms.map(function(l,i){return px(i)+","+py(l);}).reverse()).join(" ")}),React.createElement("polyline",{fill:"none",stroke:"#3274a1",strokeWidth:"2",points:mean.map(function(m,i){return px(i)+","+py(m);}).join(" ")})),xs.map(function(v,i){return React.createElement("text",{key:i,x:px(i),y:H-M.bottom+12,fontSize:"11",textAnchor:"end",transform:"rotate(-90 "+px(i)+" "+(H-M.bottom+12)+")"},fmt(v));}),React.createElement("text",{x:W/2,y:14,fontSize:"13",textAnchor:"middle"},data.y+" by "+data.x));};var Graphing=function Graphing(_ref4){var modelBuilt=_ref4.modelBuilt,modelTargets=_ref4.modelTargets,dataset=_ref4.dataset;var _React$useState7=React.useState(""),_React$useState8=_slicedToArray(_React$useState7,2),x=_React$useState8[0],setX=_React$useState8[1];var _React$useState9=React.useState(""),_React$useState10=_slicedToArray(_React$useState9,2),y=_React$useState10[0],setY=_React$useState10[1];var _React$useState11=React.useState(""),_React$useState12=_slicedToArray(_React$useState11,2),groupBy=_React$useState12[0],setGroupBy=_React$useState12[1];var _React$useState13=React.useState("scatterplot"),_React$useState14=_slicedToArray(_React$useState13,2),plotType=_React$useState14[0],setPlotType=_React$useState14[1];var _React$useState15=React.useState("ci"),_React$useState16=_slicedToArray(_React$useState15,2),errorbar=_React$useState16[0],setErrorbar=_React$useState16[1];var _React$useState17=React.useState("auto"),_React$useState18=_slicedToArray(_React$useState17,2),scatterMode=_React$useState18[0],setScatterMode=_React$useState18[1];var _React$useState19=React.useState(""),_React$useState20=_slicedToArray(_React$useState19,2),pointsNote=_React$useState20[0],setPointsNote=_React$useState20[1];var _React$useState21=React.useState(false),_React$useState22=_slicedToArray(_React$useState21,2),clientSide=_React$useState22[0],setClientSide=_React$useState22[1];var _React$useState23=React.useState(null),_React$useState24=_slicedToArray(_React$useState23,2),chartData=_React$useState24[0],setChartData=_React$useState24[1];var _React$useState25=React.useState(""),_React$useState26=_slicedToArray(_React$useState25,2),note=_React$useState26[0],setNote=_React$useState26[1];var _React$useState27=React.useState([]),_React$useState28=_slicedToArray(_React$useState27,2),columnOptions=_React$useState28[0],setColumnOptions=_React$useState28[1];var _React$useState29=React.useState(""),_React$useState30=_slicedToArray(_React$useState29,2),imgUrl=_React$useState30[0],setImgUrl=_React$useState30[1];var _React$useState31=React.useState(null),_React$useState32=_slicedToArray(_React$useState31,2),mse=_React$useState32[0],setMse=_React$useState32[1];var _React$useState33=React.useState(null),_React$useState34=_slicedToArray(_React$useState33,2),varVal=_React$useState34[0],setVar=_React$useState34[1];var _React$useState35=React.useState(false),_React$useState36=_slicedToArray(_React$useState35,2),loadingPlot=_React$useState36[0],setLoadingPlot=_React$useState36[1];var _React$useState37=React.useState(false),_React$useState38=_slicedToArray(_React$useState37,2),loadingResults=_React$useState38[0],setLoadingResults=_React$useState38[1];React.useEffect(function(){if(!groupBy){setColumnOptions([]);return;}
+fetch("/get_dataframe_columns",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({groupBy:groupBy,dataset:dataset})}).then(function(r){return r.json();}).then(function(data){setColumnOptions(data.columns||[]);}).catch(function(e){return console.error(e);});},[groupBy,dataset]);var handlePlot=async function handlePlot(){setNote("");if(!x&&!y){alert("Please select at least one variable.");return;}
+if(plotType==="pie chart"&&x&&y){setNote("Pie chart can only have one variable (choose either X or Y, not both).");return;}
+if(plotType!=="pie chart"&&!x&&!y){setNote("Please select at least one variable for this plot type.");return;}
+setLoadingPlot(true);if(clientSide&&plotType!=="scatterplot"){try{var params=new URLSearchParams({x:x,y:y,groupBy:groupBy,dataset:dataset});var response=await fetch("/plot_data?"+params.toString());if(!response.ok){alert("Data error: "+(await response.text()));return;}
+setChartData((await response.json()));setImgUrl("");}catch(e){console.error(e);}finally{setLoadingPlot(false);}
+return;}
+setChartData(null);try{var _params=new URLSearchParams({x:x,y:y,groupBy:groupBy,plotType:plotType,errorbar:errorbar,scatterMode:scatterMode,dataset:dataset});var _response=await fetch("/plot?"+_params.toString());if(!_response.ok){var txt=await _response.text();alert("Plot error: "+txt);return;}
+var blob=await _response.blob();setImgUrl(URL.createObjectURL(blob));var drawn=_response.headers.get("X-Points-Drawn");var total=_response.headers.get("X-Points-Total");setPointsNote(drawn&&total?_response.headers.get("X-Scatter-Mode")+": "+drawn+" drawn of "+total+" points":"");}catch(e){console.error(e);}finally{setLoadingPlot(false);}};var _React$useState39=React.useState(false),_React$useState40=_slicedToArray(_React$useState39,2),showResultsPanel=_React$useState40[0],setShowResultsPanel=_React$useState40[1];var _React$useState41=React.useState(""),_React$useState42=_slicedToArray(_React$useState41,2),selectedDate=_React$useState42[0],setSelectedDate=_React$useState42[1];var _React$useState43=React.useState(""),_React$useState44=_slicedToArray(_React$useState43,2),selectedModelTarget=_React$useState44[0],setSelectedModelTarget=_React$useState44[1];var _React$useState45=React.useState(""),_React$useState46=_slicedToArray(_React$useState45,2),resultsImgUrl=_React$useState46[0],setResultsImgUrl=_React$useState46[1];var _React$useState47=React.useState(null),_React$useState48=_slicedToArray(_React$useState47,2),explainedVar=_React$useState48[0],setExplainedVar=_React$useState48[1];var handleDisplayResultsClick=function handleDisplayResultsClick(){return setShowResultsPanel(true);};var handleShowResults=async function handleShowResults(){if(!selectedDate||!selectedModelTarget){alert("Please choose a date and target.");return;}
+setLoadingResults(true);try{var response=await fetch("/plot_results",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({date:selectedDate,target:selectedModelTarget,dataset:dataset})});if(!response.ok){var txt=await response.text();alert("Error: "+txt);return;}
+var data=await response.json();if(!data.image){alert("No image returned from server.");return;}
+setResultsImgUrl("data:image/png;base64,"+data.image);setMse(typeof data.mse==="number"?data.mse.toFixed(4):"N/A");setVar(typeof data.variance==="number"?data.variance.toFixed(4):"N/A");setExplainedVar(typeof data.explained_variance==="number"?data.explained_variance.toFixed(4):"N/A");}catch(e){console.error(e);}finally{setLoadingResults(false);}};return React.createElement("div",null,React.createElement("h2",null,"Graphing"),!modelBuilt&&React.createElement(React.Fragment,null,React.createElement("div",null,React.createElement("label",null,"Group By: "),React.createElement("select",{value:groupBy,onChange:function onChange(e){return setGroupBy(e.target.value);}},React.createElement("option",{value:""},"--Select--"),React.createElement("option",{value:"Group"},"Group"),React.createElement("option",{value:"Category"},"Category"),React.createElement("option",{value:"Item"},"Item"))),groupBy&&React.createElement(React.Fragment,null,React.createElement("div",{style:{marginTop:10}},React.createElement("label",null,"Plot Type: "),React.createElement("select",{value:plotType,onChange:function onChange(e){return setPlotType(e.target.value);}},React.createElement("option",{value:"barplot"},"Barplot"),React.createElement("option",{value:"scatterplot"},"Scatterplot"),React.createElement("option",{value:"line plot"},"Line Plot"),React.createElement("option",{value:"pie chart"},"Pie Chart")),(plotType==="barplot"||plotType==="line plot")&&React.createElement(React.Fragment,null,React.createElement("label",null," Error Bars: "),React.createElement("select",{value:errorbar,onChange:function onChange(e){return setErrorbar(e.target.value);}},React.createElement("option",{value:"ci"},"95% CI (fast)"),React.createElement("option",{value:"none"},"None"),React.createElement("option",{value:"bootstrap"},"Bootstrap (slow)"))),plotType==="scatterplot"&&React.createElement(React.Fragment,null,React.createElement("label",null," Points: "),React.createElement("select",{value:scatterMode,onChange:function onChange(e){return setScatterMode(e.target.value);}},React.createElement("option",{value:"auto"},"Auto"),React.createElement("option",{value:"full"},"All points"),React.createElement("option",{value:"sample"},"Sample"),React.createElement("option",{value:"hexbin"},"Hexbin density")))),React.createElement("div",{style:{marginTop:10}},React.createElement("label",null,"X: "),React.createElement("select",{value:x,onChange:function onChange(e){return setX(e.target.value);}},React.createElement("option",{value:""},"--Select--"),columnOptions.map(function(col){return React.createElement("option",{key:col,value:col},col);})),React.createElement("label",null," Y: "),React.createElement("select",{value:y,onChange:function onChange(e){return setY(e.target.value);}},React.createElement("option",{value:""},"--Select--"),columnOptions.map(function(col){return React.createElement("option",{key:col,value:col},col);})))),groupBy&&React.createElement("div",{style:{marginTop:10}},React.createElement("label",null,React.createElement("input",{type:"checkbox",checked:clientSide,onChange:function onChange(e){setClientSide(e.target.checked);setChartData(null);}}),"Draw bar/line/pie charts in the browser")),note&&React.createElement("div",{style:{marginTop:"8px",color:"darkorange",fontWeight:"bold"}},note),React.createElement("div",{style:{marginTop:"10px"}},React.createElement("button",{onClick:handlePlot,disabled:loadingPlot||!groupBy},loadingPlot?"Plotting...":"Generate Plot")),chartData&&plotType!=="scatterplot"&&React.createElement("div",{style:{marginTop:"20px"}},React.createElement(ClientChart,{data:chartData,plotType:plotType})),imgUrl&&!chartData&&React.createElement("div",{style:{marginTop:"20px"}},React.createElement("img",{src:imgUrl,alt:"Plot",style:{maxWidth:"100%"}}),pointsNote&&React.createElement("div",{style:{color:"#555"}},pointsNote))),modelBuilt&&React.createElement("div",{style:{marginTop:10}},React.createElement("button",{onClick:handleDisplayResultsClick},"Display Results")),modelBuilt&&showResultsPanel&&React.createElement("div",{style:{marginTop:12}},React.createElement("div",null,React.createElement("label",null,"Date: "),React.createElement("input",{type:"date",value:selectedDate,onChange:function onChange(e){return setSelectedDate(e.target.value);}}),React.createElement("label",null," Target: "),React.createElement("select",{value:selectedModelTarget,onChange:function onChange(e){return setSelectedModelTarget(e.target.value);}},React.createElement("option",{value:""},"--Select--"),modelTargets.map(function(t,i){return React.createElement("option",{key:i,value:t},t);})),React.createElement("button",{onClick:handleShowResults,disabled:loadingResults,style:{marginLeft:10}},loadingResults?"Plotting...":"Show Results")),resultsImgUrl&&React.createElement("div",{style:{display:"flex",alignItems:"flex-start",marginTop:16,gap:"2rem"}},React.createElement("img",{src:resultsImgUrl,alt:"Results",style:{maxWidth:"65%"}}),React.createElement("div",{style:{fontSize:"1rem",lineHeight:"1.6"}},React.createElement("strong",null,"MSE:")," ",mse,React.createElement("br",null),React.createElement("strong",null,"Variance:")," ",varVal,React.createElement("br",null),React.createElement("strong",null,"Explained Variance:")," ",explainedVar))));};var App=function App(){var _React$useState49=React.useState("File Upload"),_React$useState50=_slicedToArray(_React$useState49,2),activeTab=_React$useState50[0],setActiveTab=_React$useState50[1];var _React$useState51=React.useState([]),_React$useState52=_slicedToArray(_React$useState51,2),columnNames=_React$useState52[0],setColumnNames=_React$useState52[1];var _React$useState53=React.useState(""),_React$useState54=_slicedToArray(_React$useState53,2),targetVariable=_React$useState54[0],setTargetVariable=_React$useState54[1];var _React$useState55=React.useState(false),_React$useState56=_slicedToArray(_React$useState55,2),modelBuilt=_React$useState56[0],setModelBuilt=_React$useState56[1];var _React$useState57=React.useState([]),_React$useState58=_slicedToArray(_React$useState57,2),modelTargets=_React$useState58[0],setModelTargets=_React$useState58[1];var _React$useState59=React.useState(""),_React$useState60=_slicedToArray(_React$useState59,2),dataset=_React$useState60[0],setDataset=_React$useState60[1];var handleModelBuilt=function handleModelBuilt(targets){setModelBuilt(true);setModelTargets(targets||[]);setActiveTab("Graphing");};React.useEffect(function(){if(!dataset)return;var stopped=false;var poll=async function poll(){try{var data=await(await fetch("/model_status?dataset="+dataset)).json();if(data.ready){setModelTargets(data.targets);return;}}catch(e){console.error(e);}
+if(!stopped)setTimeout(poll,3000);};poll();return function(){stopped=true;};},[dataset]);return React.createElement("div",null,React.createElement("div",{className:"top-bar"},React.createElement("div",null,React.createElement("button",{onClick:function onClick(){return setActiveTab("File Upload");}},"File Upload"),React.createElement("button",{onClick:function onClick(){return setActiveTab("Graphing");}},"Graphing")),React.createElement("div",null,modelBuilt?React.createElement("strong",null,"Model built"):null,modelTargets.length>0&&!modelBuilt&&React.createElement("button",{onClick:function onClick(){return handleModelBuilt(modelTargets);}},"Model Results"),modelBuilt&&React.createElement("button",{onClick:function onClick(){return setModelBuilt(false);},style:{marginLeft:10}},"Back to Plots"))),React.createElement("div",{style:{padding:12}},activeTab==="File Upload"&&React.createElement(FileUpload,{setColumnNames:setColumnNames,setTargetVariable:setTargetVariable,setDataset:setDataset}),activeTab==="Graphing"&&React.createElement(Graphing,{columnNames:columnNames,modelBuilt:modelBuilt,modelTargets:modelTargets,dataset:dataset})));};ReactDOM.createRoot(document.getElementById('root')).render(React.createElement(App,null));
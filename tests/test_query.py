@@ -0,0 +1,121 @@
+# /query filters, sort and cursor paging against a small synthetic dataset
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import app as msy  # noqa: E402
+from synthetic_data import write_dataset  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("query")
+    write_dataset(str(tmp / "data"), months=4, items=30, shipment_rows=40)
+    msy.DATA_FOLDER, msy.CACHE_FOLDER = str(tmp / "data"), str(tmp / "cache")
+    os.makedirs(msy.CACHE_FOLDER)
+    client = msy.app.test_client()
+    response = client.post("/upload?wait=1")
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return client
+
+
+@pytest.fixture(scope="module")
+def items(client):
+    # the Item frame as plain columns, for computing expected results
+    ds = msy.get_dataset()
+    return msy.plot_columns(ds["item"], ["Item Name", "month", "Count"])
+
+
+def query(client, **params):
+    response = client.get("/query", query_string=params)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert int(response.headers["X-Total-Rows"]) >= len(rows)
+    return response, rows
+
+
+def named(items, *names):
+    return items["Item Name"].astype(str).str.lower().isin([n.lower() for n in names])
+
+
+def test_exact_filter(client, items):
+    response, rows = query(client, groupBy="Item", item="Item 1", columns="Item Name,month")
+    assert len(rows) == named(items, "Item 1").sum() > 0
+    assert {row["Item Name"] for row in rows} == {"Item 1"}
+    assert response.headers["X-Total-Rows"] == str(len(rows))
+
+
+def test_repeated_values_select_rows_once(client, items):
+    _, once = query(client, groupBy="Item", item="Item 1")
+    for values in (["Item 1", "item 1"], ["Item 1", "Item 1"], [" ITEM 1 ", "Item 1"]):
+        response, rows = query(client, groupBy="Item", item=values)
+        assert response.headers["X-Total-Rows"] == str(len(once))
+        assert rows == once
+
+
+def test_values_of_one_filter_are_or_ed(client, items):
+    _, rows = query(client, groupBy="Item", item=["Item 1", "Item 2"], columns="Item Name")
+    assert len(rows) == named(items, "Item 1", "Item 2").sum()
+    assert {row["Item Name"] for row in rows} == {"Item 1", "Item 2"}
+
+
+def test_month_range(client, items):
+    _, rows = query(client, groupBy="Item", month_from="February", month_to="march", columns="month")
+    assert len(rows) == items["month"].isin(["February", "March"]).sum() > 0
+    assert {row["month"] for row in rows} == {"February", "March"}
+
+
+def test_filters_are_and_ed(client, items):
+    _, rows = query(client, groupBy="Item", item=["Item 1", "Item 2"], month="January")
+    assert len(rows) == (named(items, "Item 1", "Item 2") & (items["month"] == "January")).sum() > 0
+    assert all(row["month"] == "January" for row in rows)
+
+
+@pytest.mark.parametrize("params", [{"month": "Smarch"}, {"month_from": "Smarch"}, {"month_to": "13"}])
+def test_unknown_month(client, params):
+    assert client.get("/query", query_string=dict(groupBy="Item", **params)).status_code == 400
+
+
+def test_unmatched_name(client):
+    response, rows = query(client, groupBy="Item", item="No Such Item")
+    assert rows == [] and response.headers["X-Total-Rows"] == "0"
+
+
+def test_sort(client, items):
+    _, rows = query(client, groupBy="Item", sort="-Count", columns="Count", limit=10_000)
+    counts = [row["Count"] for row in rows]
+    known = [c for c in counts if c is not None]
+    assert known == sorted(known, reverse=True)
+    assert counts[len(known):] == [None] * (len(counts) - len(known))   # missing values last
+    assert len(rows) == len(items)
+
+    _, rows = query(client, groupBy="Item", sort="month", columns="month", limit=10_000)
+    months = [row["month"] for row in rows if row["month"] is not None]
+    order = [pd.Timestamp(msy.month_start(m)) for m in months]
+    assert order == sorted(order)
+
+
+def test_cursor_round_trip(client):
+    params = {"groupBy": "Item", "month_from": "January", "month_to": "March", "sort": "-Count"}
+    _, everything = query(client, **params, limit=10_000)
+    pages, cursor = [], None
+    while True:
+        response, rows = query(client, **params, limit=7, **({"cursor": cursor} if cursor else {}))
+        assert len(rows) <= 7
+        pages += rows
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert pages == everything
+
+    response, _ = query(client, **params, limit=7)
+    cursor = response.headers["X-Next-Cursor"]
+    changed = dict(params, sort="Count", cursor=cursor)
+    assert client.get("/query", query_string=changed).status_code == 400
+    assert client.get("/query", query_string=dict(params, cursor="not-a-cursor")).status_code == 400